@@ -1,13 +1,28 @@
 """Milvus Segment Generator - Multi-language text segmentation using Gemma tokenizer."""
 
 from milvus_segment_generator.segment import segment_text, segment_text_to_json
-from milvus_segment_generator.segmentation.factory import list_supported_languages
+from milvus_segment_generator.document import TokenizedDocument
+from milvus_segment_generator.segmentation.factory import (
+    UnsupportedLanguageError,
+    list_supported_languages,
+    register_rules,
+    register_rules_file,
+)
+from milvus_segment_generator.segmentation.profiling import SegmentationProfile
+from milvus_segment_generator.segmentation.text_view import SegmentTextView, write_segmented_text
 
 __version__ = "0.0.1"
 
 __all__ = [
     "segment_text",
     "segment_text_to_json",
+    "TokenizedDocument",
     "list_supported_languages",
+    "register_rules",
+    "register_rules_file",
+    "UnsupportedLanguageError",
+    "SegmentationProfile",
+    "SegmentTextView",
+    "write_segmented_text",
 ]
 
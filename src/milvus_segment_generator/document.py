@@ -0,0 +1,313 @@
+"""Reusable tokenized documents for chunking one text with many segment sizes."""
+
+import json
+import sys
+from array import array
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from milvus_segment_generator.tokenizer import tokenize, tokenize_with_char
+from milvus_segment_generator.segment import CHAR_FALLBACK_SEGMENT_SIZE
+from milvus_segment_generator.segmentation.base import (
+    LanguageRules,
+    MAX_SEGMENT_CHAR_SPAN,
+    MAX_SEGMENT_UTF8_BYTES,
+    _no_delimiter_error,
+    _split_segment_text,
+    post_process_tokens,
+)
+from milvus_segment_generator.segmentation.factory import get_rules
+from milvus_segment_generator.segmentation.profiling import SegmentationProfile
+
+_FORMAT_VERSION = 1
+_OFFSET_TYPECODE = "q"
+
+
+class TokenizedDocument:
+    """Merged tokens of one text with precomputed offsets, reusable across segment sizes.
+
+    The tokens are stored as their concatenated text plus cumulative character
+    and UTF-8 byte offsets and a delimiter mask, so `chunk` finds cuts and
+    span lengths without joining token strings. Only oversized segments are
+    materialised, to be split at the character and byte limits.
+
+    Attributes:
+        rules: Language rules used to post-process and chunk the tokens.
+        text: Concatenation of all merged tokens (including an appended
+            delimiter when has_delimiter is False).
+        char_offsets: Cumulative character offsets; token i is
+            text[char_offsets[i]:char_offsets[i + 1]].
+        byte_offsets: Cumulative UTF-8 byte offsets of the same tokens.
+        delimiter_mask: One byte per token, 1 if the token ends with a delimiter.
+        has_delimiter: False if the last token is an appended delimiter.
+        char_level: True if the tokens are characters because the tokenizer
+            output overran the text, as in `segment_text`; `chunk` then uses
+            CHAR_FALLBACK_SEGMENT_SIZE like `segment_text` does.
+    """
+
+    def __init__(
+        self,
+        rules: LanguageRules,
+        text: str,
+        char_offsets: array,
+        byte_offsets: array,
+        delimiter_mask: bytearray,
+        has_delimiter: bool,
+        char_level: bool = False,
+    ):
+        self.rules = rules
+        self.text = text
+        self.char_offsets = char_offsets
+        self.byte_offsets = byte_offsets
+        self.delimiter_mask = delimiter_mask
+        self.has_delimiter = has_delimiter
+        self.char_level = char_level
+
+    @classmethod
+    def from_tokens(
+        cls,
+        tokens: List[str],
+        rules: LanguageRules,
+        has_delimiter: bool,
+        char_level: bool = False,
+    ) -> "TokenizedDocument":
+        """Build a document from already post-processed tokens.
+
+        Args:
+            tokens: Merged token strings, as passed to `chunk_spans`.
+            rules: Language rules specifying valid delimiters.
+            has_delimiter: False if the last token is an appended delimiter.
+            char_level: Whether the tokens are character-level fallback tokens.
+
+        Returns:
+            TokenizedDocument holding the tokens' offsets and delimiter mask.
+        """
+        delimiters = rules.delimiters
+        char_offsets = array(_OFFSET_TYPECODE, [0])
+        byte_offsets = array(_OFFSET_TYPECODE, [0])
+        delimiter_mask = bytearray(len(tokens))
+        char_total = 0
+        byte_total = 0
+        for index, token in enumerate(tokens):
+            char_total += len(token)
+            byte_total += len(token.encode("utf-8"))
+            char_offsets.append(char_total)
+            byte_offsets.append(byte_total)
+            if token.endswith(delimiters):
+                delimiter_mask[index] = 1
+        return cls(rules, "".join(tokens), char_offsets, byte_offsets, delimiter_mask, has_delimiter, char_level)
+
+    @classmethod
+    def from_text(cls, text: str, lang: str) -> "TokenizedDocument":
+        """Tokenize and post-process text once, as `segment_text` does.
+
+        Falls back to character tokens when the decoded tokens are longer than
+        the text. Unlike `segment_text`, this is decided before any chunking,
+        so it does not depend on the segment size.
+
+        Args:
+            text: Input text to tokenize.
+            lang: Language code or name (e.g., 'tibetan', 'bo', 'english', 'en').
+
+        Returns:
+            TokenizedDocument ready for `chunk`.
+        """
+        rules = get_rules(lang)
+        tokens, has_delimiter = tokenize(text, rules)
+        tokens = post_process_tokens(tokens, rules)
+        document = cls.from_tokens(tokens, rules, has_delimiter)
+        if len(document) and len(text) < document.char_offsets[-1] - (0 if has_delimiter else 1):
+            tokens, has_delimiter = tokenize_with_char(text, rules)
+            tokens = post_process_tokens(tokens, rules)
+            document = cls.from_tokens(tokens, rules, has_delimiter, char_level=True)
+        return document
+
+    def __len__(self) -> int:
+        """Number of merged tokens."""
+        return len(self.delimiter_mask)
+
+    @property
+    def tokens(self) -> List[str]:
+        """Merged token strings, rebuilt from text and offsets."""
+        text = self.text
+        offsets = self.char_offsets
+        return [text[offsets[index]:offsets[index + 1]] for index in range(len(self))]
+
+    def chunk(
+        self,
+        segment_size: int,
+        with_text: bool = True,
+        profile: Optional[SegmentationProfile] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Chunk the document; same output as `chunk_spans` on the tokens.
+
+        Args:
+            segment_size: Maximum number of tokens per segment. Ignored for
+                char_level documents, which use CHAR_FALLBACK_SEGMENT_SIZE.
+            with_text: Build the newline-joined segment text.
+            profile: Optional SegmentationProfile recording per-segment costs.
+
+        Returns:
+            Tuple of (spans, segmented_text), as returned by `chunk_spans`.
+
+        Raises:
+            ValueError: If segment_size is invalid or no delimiter found within window.
+        """
+        if segment_size <= 0:
+            raise ValueError("segment_size must be a positive integer")
+        if self.char_level:
+            segment_size = CHAR_FALLBACK_SEGMENT_SIZE
+
+        text = self.text
+        char_offsets = self.char_offsets
+        byte_offsets = self.byte_offsets
+        delimiter_mask = self.delimiter_mask
+        delimiter_set = self.rules.delimiter_set
+        total_tokens = len(self)
+
+        if profile is not None:
+            profile.start_pass(total_tokens, segment_size)
+
+        # Find all cuts first so a missing delimiter raises before any output is built
+        cut_indices: List[int] = []
+        start_index = 0
+        while start_index < total_tokens:
+            upper_bound = min(start_index + segment_size, total_tokens)
+            last_delimiter = delimiter_mask.rfind(1, start_index, upper_bound)
+            if last_delimiter == -1:
+                if profile is not None:
+                    profile.record_failure(start_index)
+                raise _no_delimiter_error(self.rules, segment_size, start_index)
+            start_index = last_delimiter + 1
+            cut_indices.append(start_index)
+
+        spans: List[dict] = []
+        segmented_parts: List[str] = []
+        start_index = 0
+        for cut_index in cut_indices:
+            char_start = char_offsets[start_index]
+            char_end = char_offsets[cut_index]
+            byte_length = byte_offsets[cut_index] - byte_offsets[start_index]
+            if char_end - char_start <= MAX_SEGMENT_CHAR_SPAN and byte_length <= MAX_SEGMENT_UTF8_BYTES:
+                segment_bounds = [(0, char_end - char_start)]
+            else:
+                segment_bounds = _split_segment_text(text[char_start:char_end], delimiter_set, MAX_SEGMENT_CHAR_SPAN)
+
+            for rel_start, rel_end in segment_bounds:
+                spans.append({
+                    "span": {
+                        "start": char_start + rel_start,
+                        "end": char_start + rel_end
+                    }
+                })
+                if with_text:
+                    segmented_parts.append(text[char_start + rel_start:char_start + rel_end])
+
+            if profile is not None:
+                profile.record_segment(start_index, cut_index, char_end - char_start, len(segment_bounds))
+            start_index = cut_index
+
+        if not self.has_delimiter and spans:
+            spans[-1]["span"]["end"] = spans[-1]["span"]["end"] - 1
+            if segmented_parts:
+                segmented_parts[-1] = segmented_parts[-1][:-1]
+
+        segmented_text = "\n".join(segmented_parts) if with_text else None
+
+        return spans, segmented_text
+
+    def save(self, path: str | Path) -> Path:
+        """Write the document to a compact binary file.
+
+        The file holds a JSON header line followed by the raw offset arrays,
+        the delimiter mask and the UTF-8 text, so loading is a few bulk reads.
+
+        Args:
+            path: Output file path.
+
+        Returns:
+            Path object pointing to the written file.
+        """
+        encoded_text = self.text.encode("utf-8")
+        header = {
+            "version": _FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "rules": {
+                "name": self.rules.name,
+                "delimiters": list(self.rules.delimiters),
+                "merge_templates": [list(template) for template in self.rules.merge_templates],
+            },
+            "has_delimiter": self.has_delimiter,
+            "char_level": self.char_level,
+            "tokens": len(self),
+            "text_bytes": len(encoded_text),
+        }
+
+        output_file = Path(path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        with output_file.open("wb") as handle:
+            handle.write(json.dumps(header, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.char_offsets.tofile(handle)
+            self.byte_offsets.tofile(handle)
+            handle.write(self.delimiter_mask)
+            handle.write(encoded_text)
+        return output_file
+
+    @classmethod
+    def load(cls, path: str | Path) -> "TokenizedDocument":
+        """Read a document written by `save`.
+
+        Args:
+            path: Path to the saved document.
+
+        Returns:
+            The loaded TokenizedDocument.
+
+        Raises:
+            ValueError: If the file is not a supported TokenizedDocument file,
+                or is truncated or inconsistent with its header.
+        """
+        input_file = Path(path)
+        with input_file.open("rb") as handle:
+            try:
+                header = json.loads(handle.readline().decode("utf-8"))
+            except ValueError as exc:
+                raise ValueError(f"{input_file} is not a TokenizedDocument file") from exc
+            if not isinstance(header, dict) or header.get("version") != _FORMAT_VERSION:
+                raise ValueError(f"Unsupported TokenizedDocument file: {input_file}")
+
+            try:
+                token_count = header["tokens"]
+                text_bytes = header["text_bytes"]
+                rules_data = header["rules"]
+                rules = LanguageRules(
+                    name=rules_data["name"],
+                    delimiters=tuple(rules_data["delimiters"]),
+                    merge_templates=tuple(tuple(template) for template in rules_data["merge_templates"]),
+                )
+                has_delimiter = header["has_delimiter"]
+                char_level = header["char_level"]
+                byteorder = header["byteorder"]
+                char_offsets = array(_OFFSET_TYPECODE)
+                byte_offsets = array(_OFFSET_TYPECODE)
+                char_offsets.fromfile(handle, token_count + 1)
+                byte_offsets.fromfile(handle, token_count + 1)
+            except (KeyError, TypeError, EOFError) as exc:
+                raise ValueError(f"Truncated or malformed TokenizedDocument file: {input_file}") from exc
+            delimiter_mask = bytearray(handle.read(token_count))
+            raw_text = handle.read(text_bytes)
+
+        if len(delimiter_mask) != token_count or len(raw_text) != text_bytes:
+            raise ValueError(f"Truncated TokenizedDocument file: {input_file}")
+        text = raw_text.decode("utf-8")
+
+        if byteorder != sys.byteorder:
+            char_offsets.byteswap()
+            byte_offsets.byteswap()
+        if char_offsets[-1] != len(text) or byte_offsets[-1] != text_bytes:
+            raise ValueError(f"TokenizedDocument offsets do not match the stored text: {input_file}")
+
+        return cls(rules, text, char_offsets, byte_offsets, delimiter_mask, has_delimiter, char_level)
+
+
+__all__ = ["TokenizedDocument"]
@@ -1,37 +1,211 @@
 """Public API for text segmentation across multiple languages."""
 
 import json
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Sequence, Tuple, Union
 
-from milvus_segment_generator.tokenizer import tokenize, tokenize_with_char
-from milvus_segment_generator.segmentation.base import post_process_tokens, chunk_spans
+from milvus_segment_generator.tokenizer import decode_tokens, delimiter_check, tokenize, tokenize_with_char
+from milvus_segment_generator.segmentation.base import (
+    LanguageRules,
+    post_process_tokens,
+    chunk_spans,
+    _spans_from_cuts,
+)
 from milvus_segment_generator.segmentation.factory import get_rules
+from milvus_segment_generator.segmentation.profiling import SegmentationProfile
+from milvus_segment_generator.segmentation.sharding import (
+    find_shard_bounds,
+    find_shard_cut_indices,
+    stitch_cut_indices,
+)
+from milvus_segment_generator.segmentation.text_view import SegmentTextView
 
-def segment_text(text: str, lang: str, segment_size: int = 1990) -> List[dict]:
+# Segment size used when token spans overrun the text and character tokens are used instead
+CHAR_FALLBACK_SEGMENT_SIZE = 2200
+# Target shard length in characters for parallel segmentation of a single document
+DEFAULT_SHARD_CHARS = 1_000_000
+
+
+def segment_text(
+    text: str,
+    lang: str,
+    segment_size: int = 1990,
+    lazy_text: bool = False,
+    workers: int = 1,
+    shard_chars: int = DEFAULT_SHARD_CHARS,
+    executor: Optional[Executor] = None,
+    profile: Optional[SegmentationProfile] = None,
+) -> Tuple[List[dict], Union[str, SegmentTextView]]:
     """Segment text into chunks and return character spans.
     
     Args:
         text: Input text to segment.
         lang: Language code or name (e.g., 'tibetan', 'bo', 'english', 'en', 'chinese', 'zh').
         segment_size: Maximum number of tokens per segment (default: 1990).
+        lazy_text: Return a `SegmentTextView` that slices `text` by span on
+            demand instead of building the newline-joined segment string.
+        workers: Number of worker processes used to tokenize and chunk shards
+            of a large text in parallel (default: 1, serial).
+        shard_chars: Target shard length in characters for parallel runs.
+        executor: Optional executor to run shards on instead of a new
+            process pool; enables sharding regardless of workers.
+        profile: Optional SegmentationProfile that records stage timings and
+            the costliest segments (and cProfile/tracemalloc data if enabled).
         
     Returns:
-        List of span dictionaries with 'start' and 'end' character offsets.
+        Tuple of (spans, segments): span dictionaries with 'start' and 'end'
+        character offsets, and the segment text (a newline-joined string, or
+        a SegmentTextView when lazy_text is True).
         
     Example:
-        >>> spans = segment_text("བཅོམ་ལྡན་འདས།", lang="tibetan", segment_size=100)
+        >>> spans, segments = segment_text("བཅོམ་ལྡན་འདས།", lang="tibetan", segment_size=100)
         >>> print(spans)
         [{"span": {"start": 0, "end": 15}}]
     """
     rules = get_rules(lang)
-    tokens, has_delimiter = tokenize(text, rules)
-    tokens = post_process_tokens(tokens, rules)
-    spans, segments = chunk_spans(tokens, rules, segment_size, has_delimiter)
-    if len(text) < spans[-1]["span"]["end"]:
-        tokens, has_delimiter = tokenize_with_char(text, rules)
+    with_text = not lazy_text
+
+    with profile.session() if profile is not None else nullcontext():
+        shard_bounds = [(0, len(text))]
+        if workers > 1 or executor is not None:
+            with _stage(profile, "shard_bounds"):
+                shard_bounds = find_shard_bounds(text, rules, shard_chars, tokenize=decode_tokens)
+
+        if len(shard_bounds) > 1:
+            spans, segmented_text = _segment_text_sharded(
+                text, rules, segment_size, shard_bounds, workers, executor, with_text, profile
+            )
+        else:
+            spans, segmented_text = _segment_text_serial(text, rules, segment_size, with_text, profile)
+
+    if segmented_text is None:
+        return spans, SegmentTextView(text, spans)
+    return spans, segmented_text
+
+
+def _stage(profile: Optional[SegmentationProfile], name: str):
+    return profile.stage(name) if profile is not None else nullcontext()
+
+
+def _segment_text_serial(
+    text: str,
+    rules: LanguageRules,
+    segment_size: int,
+    with_text: bool,
+    profile: Optional[SegmentationProfile] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    with _stage(profile, "tokenize"):
+        tokens, has_delimiter = tokenize(text, rules)
+    with _stage(profile, "post_process"):
         tokens = post_process_tokens(tokens, rules)
-        spans, segments = chunk_spans(tokens, rules, segment_size=2200, has_delimiter=has_delimiter)
+    with _stage(profile, "chunk"):
+        spans, segments = chunk_spans(tokens, rules, segment_size, has_delimiter, with_text=with_text, profile=profile)
+    if spans and len(text) < spans[-1]["span"]["end"]:
+        if profile is not None:
+            profile.fallback_to_chars = True
+        with _stage(profile, "tokenize"):
+            tokens, has_delimiter = tokenize_with_char(text, rules)
+        with _stage(profile, "post_process"):
+            tokens = post_process_tokens(tokens, rules)
+        with _stage(profile, "chunk"):
+            spans, segments = chunk_spans(
+                tokens, rules, segment_size=CHAR_FALLBACK_SEGMENT_SIZE, has_delimiter=has_delimiter,
+                with_text=with_text, profile=profile,
+            )
+    return spans, segments
+
+
+def _tokenize_and_cut_shard(
+    shard_text: str,
+    rules: LanguageRules,
+    segment_size: int,
+    is_last: bool,
+    char_level: bool,
+) -> Tuple[List[str], bool, List[int]]:
+    """Worker task: tokenize, post-process and chunk one shard of a document."""
+    tokens = list(shard_text) if char_level else decode_tokens(shard_text)
+    has_delimiter = True
+    if is_last:
+        # Only the document end may need the appended delimiter
+        tokens, has_delimiter = delimiter_check(tokens, rules)
+    tokens = post_process_tokens(tokens, rules)
+    return tokens, has_delimiter, find_shard_cut_indices(tokens, rules, segment_size)
+
+
+def _chunk_shards(
+    text: str,
+    rules: LanguageRules,
+    segment_size: int,
+    shard_bounds: Sequence[Tuple[int, int]],
+    executor: Executor,
+    char_level: bool,
+    with_text: bool,
+    profile: Optional[SegmentationProfile] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    if segment_size <= 0:
+        raise ValueError("segment_size must be a positive integer")
+
+    last_shard = len(shard_bounds) - 1
+    futures = [
+        executor.submit(
+            _tokenize_and_cut_shard, text[start:end], rules, segment_size, index == last_shard, char_level
+        )
+        for index, (start, end) in enumerate(shard_bounds)
+    ]
+
+    tokens: List[str] = []
+    shard_token_bounds: List[Tuple[int, int]] = []
+    shard_cut_indices: List[List[int]] = []
+    has_delimiter = True
+    with _stage(profile, "shards"):
+        for future in futures:
+            shard_tokens, has_delimiter, cut_indices = future.result()
+            shard_token_bounds.append((len(tokens), len(tokens) + len(shard_tokens)))
+            shard_cut_indices.append(cut_indices)
+            tokens.extend(shard_tokens)
+
+    with _stage(profile, "chunk"):
+        if profile is not None:
+            profile.start_pass(len(tokens), segment_size)
+        cut_indices = stitch_cut_indices(tokens, shard_token_bounds, shard_cut_indices, rules, segment_size, profile)
+        return _spans_from_cuts(tokens, cut_indices, rules, has_delimiter, with_text, profile)
+
+
+def _segment_text_sharded(
+    text: str,
+    rules: LanguageRules,
+    segment_size: int,
+    shard_bounds: Sequence[Tuple[int, int]],
+    workers: int,
+    executor: Optional[Executor],
+    with_text: bool,
+    profile: Optional[SegmentationProfile] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """Parallel counterpart of `_segment_text_serial`.
+
+    Shards are tokenized and chunked independently, then their cuts are
+    stitched with global token offsets. The output matches the serial output
+    when every shard starts tokenizing exactly as the whole text does there;
+    `find_shard_bounds` checks this with the tokenizer on a window around
+    each boundary, which holds unless a token depends on context further away.
+    """
+    pool = executor if executor is not None else ProcessPoolExecutor(max_workers=workers)
+    try:
+        spans, segments = _chunk_shards(
+            text, rules, segment_size, shard_bounds, pool, char_level=False, with_text=with_text, profile=profile
+        )
+        if spans and len(text) < spans[-1]["span"]["end"]:
+            if profile is not None:
+                profile.fallback_to_chars = True
+            spans, segments = _chunk_shards(
+                text, rules, CHAR_FALLBACK_SEGMENT_SIZE, shard_bounds, pool, char_level=True,
+                with_text=with_text, profile=profile,
+            )
+    finally:
+        if executor is None:
+            pool.shutdown()
     return spans, segments
 
 
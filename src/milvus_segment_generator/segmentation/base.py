@@ -1,7 +1,12 @@
 """Shared types and logic for text segmentation across languages."""
 
+import re
 from dataclasses import dataclass
-from typing import List, Tuple
+from functools import cached_property
+from typing import TYPE_CHECKING, Collection, Dict, FrozenSet, List, Optional, Pattern, Tuple
+
+if TYPE_CHECKING:
+    from milvus_segment_generator.segmentation.profiling import SegmentationProfile
 
 # Placeholder for merge templates to indicate "any delimiter from the rule set"
 ANY_DELIM = "DELIM"
@@ -15,7 +20,7 @@ class LanguageRules:
     
     Attributes:
         name: Language identifier.
-        delimiters: Tuple of delimiter characters that mark segment boundaries.
+        delimiters: Tuple of single delimiter characters that mark segment boundaries.
         merge_templates: Tuple of token patterns to merge. Each pattern is a tuple
             where ANY_DELIM represents "the same delimiter". Empty tuple means no merging.
     """
@@ -23,6 +28,72 @@ class LanguageRules:
     delimiters: Tuple[str, ...]
     merge_templates: Tuple[Tuple[str, ...], ...] = tuple()
 
+    def __post_init__(self) -> None:
+        if not isinstance(self.name, str) or not self.name.strip():
+            raise ValueError("LanguageRules.name must be a non-empty string")
+
+        delimiters = tuple(self.delimiters)
+        if not delimiters:
+            raise ValueError(f"Language {self.name!r} must define at least one delimiter")
+        for delimiter in delimiters:
+            # Splitting and trailing-delimiter trimming work on single characters
+            if not isinstance(delimiter, str) or len(delimiter) != 1:
+                raise ValueError(
+                    f"Language {self.name!r} has an invalid delimiter {delimiter!r}: "
+                    f"delimiters must be single characters"
+                )
+
+        merge_templates = tuple(tuple(template) for template in self.merge_templates)
+        for template in merge_templates:
+            if not template:
+                raise ValueError(f"Language {self.name!r} has an empty merge template")
+            for token in template:
+                if not isinstance(token, str) or not token:
+                    raise ValueError(
+                        f"Language {self.name!r} has an invalid merge template token: {token!r}"
+                    )
+
+        # Normalise list input (e.g. from config files) to the declared tuple types.
+        object.__setattr__(self, "delimiters", delimiters)
+        object.__setattr__(self, "merge_templates", merge_templates)
+
+    @cached_property
+    def delimiter_set(self) -> FrozenSet[str]:
+        """Delimiters as a frozenset for O(1) membership checks."""
+        return frozenset(self.delimiters)
+
+    @cached_property
+    def delimiter_pattern(self) -> Pattern[str]:
+        """Regex matching any single delimiter character."""
+        return re.compile("[" + "".join(re.escape(delimiter) for delimiter in self.delimiters) + "]")
+
+    @cached_property
+    def shard_unsafe_starts(self) -> Tuple[str, ...]:
+        """Strings a shard must not start with: delimiters and merge template tokens."""
+        template_tokens = {token for template in self.merge_templates for token in template if token != ANY_DELIM}
+        return tuple(sorted(self.delimiter_set | template_tokens))
+
+    @cached_property
+    def merge_patterns(self) -> Tuple[Tuple[str, ...], ...]:
+        """Concrete merge patterns, expanded once from the templates."""
+        return tuple(tuple(pattern) for pattern in _expand_merge_patterns(self))
+
+    @cached_property
+    def merge_index(self) -> Dict[str, Tuple[Tuple[Tuple[str, ...], str], ...]]:
+        """Merge patterns keyed by their first token, in priority order.
+
+        Each entry is a ``(pattern, merged_token)`` pair so matching a token
+        only tries patterns that can possibly start with it.
+        """
+        index: Dict[str, List[Tuple[Tuple[str, ...], str]]] = {}
+        for pattern in self.merge_patterns:
+            index.setdefault(pattern[0], []).append((pattern, "".join(pattern)))
+        return {first: tuple(entries) for first, entries in index.items()}
+
+    def ends_with_delimiter(self, token: str) -> bool:
+        """Return True if the token ends with any of the delimiters."""
+        return token.endswith(self.delimiters)
+
 
 def _expand_merge_patterns(rules: LanguageRules) -> List[List[str]]:
     """Expand merge templates into concrete patterns for each delimiter.
@@ -54,18 +125,19 @@ def post_process_tokens(tokens: List[str], rules: LanguageRules) -> List[str]:
     Returns:
         List of tokens with specified patterns merged into single tokens.
     """
-    patterns = _expand_merge_patterns(rules)
-    if not patterns:
+    merge_index = rules.merge_index
+    if not merge_index:
         return tokens  # No merging needed
     
     merged: List[str] = []
     i = 0
-    while i < len(tokens):
+    total_tokens = len(tokens)
+    while i < total_tokens:
         matched = False
-        for pattern in patterns:
+        for pattern, merged_token in merge_index.get(tokens[i], ()):
             n = len(pattern)
-            if i + n <= len(tokens) and tokens[i:i+n] == pattern:
-                merged.append("".join(pattern))
+            if i + n <= total_tokens and tuple(tokens[i:i+n]) == pattern:
+                merged.append(merged_token)
                 i += n
                 matched = True
                 break
@@ -77,12 +149,10 @@ def post_process_tokens(tokens: List[str], rules: LanguageRules) -> List[str]:
     return merged
 
 
-def _find_split_end(segment_text: str, start: int, candidate_end: int, delimiters: Tuple[str, ...]) -> int:
+def _find_split_end(segment_text: str, start: int, candidate_end: int, delimiters: Collection[str]) -> int:
     """Choose a split end <= candidate_end, preferring delimiters and whitespace."""
-    delimiter_set = set(delimiters)
-
     for pos in range(candidate_end, start, -1):
-        if segment_text[pos - 1] in delimiter_set:
+        if segment_text[pos - 1] in delimiters:
             return pos
 
     for pos in range(candidate_end, start, -1):
@@ -117,7 +187,7 @@ def _find_max_utf8_safe_end(
 
 def _split_segment_text(
     segment_text: str,
-    delimiters: Tuple[str, ...],
+    delimiters: Collection[str],
     max_segment_char_span: int,
     max_segment_utf8_bytes: int = MAX_SEGMENT_UTF8_BYTES,
 ) -> List[Tuple[int, int]]:
@@ -156,16 +226,31 @@ def _split_segment_text(
     return bounds
 
 
-def chunk_spans(tokens: List[str], rules: LanguageRules, segment_size: int, has_delimiter: bool) -> List[dict]:
+def chunk_spans(
+    tokens: List[str],
+    rules: LanguageRules,
+    segment_size: int,
+    has_delimiter: bool,
+    with_text: bool = True,
+    profile: Optional["SegmentationProfile"] = None,
+) -> Tuple[List[dict], Optional[str]]:
     """Chunk tokens into segments ending at delimiters and return character spans.
     
     Args:
         tokens: List of decoded token strings.
         rules: Language rules specifying valid delimiters.
         segment_size: Maximum number of tokens per segment.
+        has_delimiter: False if the last token is a delimiter appended by the
+            tokenizer, which is then trimmed from the last span.
+        with_text: Build the newline-joined segment text. Pass False to skip
+            the copy and use `SegmentTextView` over the source text instead.
+        profile: Optional SegmentationProfile recording per-segment scan
+            lengths and splits.
         
     Returns:
-        List of span dictionaries with 'start' and 'end' character offsets.
+        Tuple of (spans, segmented_text): span dictionaries with 'start' and
+        'end' character offsets, and the segments joined by newlines (None
+        when with_text is False).
         
     Raises:
         ValueError: If segment_size is invalid or no delimiter found within window.
@@ -173,41 +258,89 @@ def chunk_spans(tokens: List[str], rules: LanguageRules, segment_size: int, has_
     if segment_size <= 0:
         raise ValueError("segment_size must be a positive integer")
     
-    spans: List[dict] = []
-    segmented_parts: List[str] = []
+    if profile is not None:
+        profile.start_pass(len(tokens), segment_size)
+    cut_indices = _find_cut_indices(tokens, rules, segment_size, profile)
+    return _spans_from_cuts(tokens, cut_indices, rules, has_delimiter, with_text, profile)
+
+
+def _next_cut_index(
+    tokens: List[str],
+    start_index: int,
+    segment_size: int,
+    delimiters: Tuple[str, ...],
+) -> Optional[int]:
+    """Return the cut after the last delimiter-ending token in the window, or None."""
+    upper_bound = min(start_index + segment_size, len(tokens))
+    # Search backward from upper_bound for a token ending with a delimiter
+    for idx in range(upper_bound - 1, start_index - 1, -1):
+        if tokens[idx].endswith(delimiters):
+            return idx + 1
+    return None
+
+
+def _no_delimiter_error(rules: LanguageRules, segment_size: int, start_index: int) -> ValueError:
+    return ValueError(
+        f"Unable to find a delimiter {rules.delimiters} within "
+        f"{segment_size} tokens starting at index {start_index}."
+    )
+
+
+def _find_cut_indices(
+    tokens: List[str],
+    rules: LanguageRules,
+    segment_size: int,
+    profile: Optional["SegmentationProfile"] = None,
+) -> List[int]:
+    """Greedily choose segment end indices, each at most segment_size tokens after the previous."""
+    cut_indices: List[int] = []
     start_index = 0
-    char_offset = 0
     total_tokens = len(tokens)
-    
-    
+    delimiters = rules.delimiters
+
     while start_index < total_tokens:
-        upper_bound = min(start_index + segment_size, total_tokens)
-        cut_index = None
-        
-        # Search backward from upper_bound for a token ending with a delimiter
-        for idx in range(upper_bound - 1, start_index - 1, -1):
-            if any(tokens[idx].endswith(delimiter) for delimiter in rules.delimiters):
-                cut_index = idx + 1
-                break
-        
+        cut_index = _next_cut_index(tokens, start_index, segment_size, delimiters)
         if cut_index is None:
-            raise ValueError(
-                f"Unable to find a delimiter {rules.delimiters} within "
-                f"{segment_size} tokens starting at index {start_index}."
-            )
-        
+            if profile is not None:
+                profile.record_failure(start_index)
+            raise _no_delimiter_error(rules, segment_size, start_index)
+        cut_indices.append(cut_index)
+        start_index = cut_index
+
+    return cut_indices
+
+
+def _spans_from_cuts(
+    tokens: List[str],
+    cut_indices: List[int],
+    rules: LanguageRules,
+    has_delimiter: bool,
+    with_text: bool = True,
+    profile: Optional["SegmentationProfile"] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """Build character spans (and optionally segment text) for the given cut indices.
+
+    A profile, if given, must already have started a pass for these tokens.
+    """
+    spans: List[dict] = []
+    segmented_parts: List[str] = []
+    start_index = 0
+    char_offset = 0
+    delimiter_set = rules.delimiter_set
+
+    for cut_index in cut_indices:
         segment_tokens = tokens[start_index:cut_index]
         segment_text = "".join(segment_tokens)
         segment_bounds = _split_segment_text(
             segment_text,
-            rules.delimiters,
+            delimiter_set,
             MAX_SEGMENT_CHAR_SPAN,
         )
 
         for rel_start, rel_end in segment_bounds:
-            piece = segment_text[rel_start:rel_end]
             piece_length = rel_end - rel_start
-            segmented_parts.append(piece)
+            if with_text:
+                segmented_parts.append(segment_text[rel_start:rel_end])
 
             spans.append({
                 "span": {
@@ -217,15 +350,16 @@ def chunk_spans(tokens: List[str], rules: LanguageRules, segment_size: int, has_
             })
             char_offset += piece_length
 
+        if profile is not None:
+            profile.record_segment(start_index, cut_index, len(segment_text), len(segment_bounds))
         start_index = cut_index
     
-    segmented_text = "\n".join(segmented_parts)
-
     if not has_delimiter and spans:
         spans[-1]["span"]["end"] = spans[-1]['span']['end'] - 1
         if segmented_parts:
             segmented_parts[-1] = segmented_parts[-1][:-1]
-            segmented_text = "\n".join(segmented_parts)
+
+    segmented_text = "\n".join(segmented_parts) if with_text else None
     
     return spans, segmented_text
 
@@ -1,8 +1,27 @@
 """Factory for retrieving language-specific segmentation rules."""
 
+import os
+import warnings
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple
+
 from milvus_segment_generator.segmentation.base import LanguageRules
+from milvus_segment_generator.segmentation.loader import (
+    RuleSpec,
+    iter_entry_points,
+    load_entry_point_rules,
+    load_rules_file,
+)
 from milvus_segment_generator.segmentation.rules import tibetan, english, chinese
 
+# Environment variable listing extra rule config files (os.pathsep-separated)
+RULES_PATH_ENV = "MILVUS_SEGMENT_RULES"
+
+
+class UnsupportedLanguageError(ValueError):
+    """Raised when no segmentation rules are registered for a language."""
+
 
 # Map language codes and names to their rules
 _LANGUAGE_REGISTRY: dict[str, LanguageRules] = {
@@ -11,12 +30,12 @@ _LANGUAGE_REGISTRY: dict[str, LanguageRules] = {
     "bo": tibetan.rules,
     "bod": tibetan.rules,
     "tib": tibetan.rules,
-    
+
     # English
     "english": english.rules,
     "en": english.rules,
     "eng": english.rules,
-    
+
     # Chinese
     "chinese": chinese.rules,
     "zh": chinese.rules,
@@ -25,29 +44,157 @@ _LANGUAGE_REGISTRY: dict[str, LanguageRules] = {
     "lzh": chinese.rules,
 }
 
+_external_rules_loaded = False
+# External rule sources that were skipped, mapped to the reason
+_external_rule_errors: Dict[str, str] = {}
+
+
+def _normalize(lang: str) -> str:
+    return (lang or "").lower().strip()
+
+
+def register_rules(rules: LanguageRules, aliases: Iterable[str] = (), override: bool = False) -> LanguageRules:
+    """Register language rules under their name and any extra aliases.
+
+    Args:
+        rules: Validated language rules.
+        aliases: Additional language codes or names (case-insensitive).
+        override: Replace rules already registered under any of these names.
+            Every alias of the replaced rules then resolves to the new rules,
+            so a language never has different rules depending on the alias.
+
+    Returns:
+        The registered LanguageRules.
+
+    Raises:
+        TypeError: If rules is not a LanguageRules instance.
+        ValueError: If a name is already registered for other rules and
+            override is False.
+    """
+    if not isinstance(rules, LanguageRules):
+        raise TypeError(f"Expected LanguageRules, got {type(rules).__name__}")
+    # External sources register first, so application rules are checked against them
+    _load_external_rules()
+
+    keys = [_normalize(alias) for alias in (rules.name, *aliases)]
+    replaced: List[LanguageRules] = []
+    for key in keys:
+        existing = _LANGUAGE_REGISTRY.get(key)
+        if existing is not None and existing != rules and existing not in replaced:
+            replaced.append(existing)
+    if replaced and not override:
+        conflicts = sorted({key for key in keys if _LANGUAGE_REGISTRY.get(key) in replaced})
+        raise ValueError(
+            f"Language names {conflicts} are already registered for "
+            f"{sorted({existing.name for existing in replaced})}; pass override=True to replace them"
+        )
+
+    for key, existing in list(_LANGUAGE_REGISTRY.items()):
+        if existing in replaced:
+            _LANGUAGE_REGISTRY[key] = rules
+    for key in keys:
+        _LANGUAGE_REGISTRY[key] = rules
+    return rules
+
+
+def register_rules_file(path: str | Path, override: bool = False) -> List[LanguageRules]:
+    """Load rules from a JSON config file and register them.
+
+    Args:
+        path: Path to a rule config file (see `load_rules_file`).
+        override: Replace rules already registered under the same names
+            (see `register_rules`).
+
+    Returns:
+        List of the registered LanguageRules.
+    """
+    return [register_rules(rules, aliases, override) for rules, aliases in load_rules_file(path)]
+
+
+def _register_source(specs: List[RuleSpec]) -> None:
+    """Register all specs of one source, or none of them if any conflicts."""
+    snapshot = dict(_LANGUAGE_REGISTRY)
+    try:
+        for rules, aliases in specs:
+            register_rules(rules, aliases)
+    except ValueError:
+        _LANGUAGE_REGISTRY.clear()
+        _LANGUAGE_REGISTRY.update(snapshot)
+        raise
+
+
+def _load_external_rules() -> None:
+    """Register rules from entry points and RULES_PATH_ENV, once per process.
+
+    Each entry point and config file is registered on its own. A source that
+    fails to load or reuses an already registered name is skipped with a
+    RuntimeWarning and named in UnsupportedLanguageError messages; built-in
+    languages and the other sources keep working. Sources are not read again
+    on later lookups.
+    """
+    global _external_rules_loaded
+    if _external_rules_loaded:
+        return
+    _external_rules_loaded = True
+
+    sources: List[Tuple[str, Callable[[], List[RuleSpec]]]] = [
+        (f"entry point {entry_point.name!r}", partial(load_entry_point_rules, [entry_point]))
+        for entry_point in iter_entry_points()
+    ]
+    for path in os.getenv(RULES_PATH_ENV, "").split(os.pathsep):
+        if path.strip():
+            sources.append((path.strip(), partial(load_rules_file, path.strip())))
+
+    for source, load in sources:
+        try:
+            _register_source(load())
+        except Exception as exc:  # third-party entry points may fail in any way
+            _external_rule_errors[source] = str(exc)
+            warnings.warn(f"Skipping segmentation rules from {source}: {exc}", RuntimeWarning, stacklevel=3)
+
 
 def get_rules(lang: str) -> LanguageRules:
     """Get segmentation rules for a given language.
-    
+
     Args:
-        lang: Language code or name (case-insensitive). 
+        lang: Language code or name (case-insensitive).
               Examples: 'tibetan', 'bo', 'english', 'en', 'chinese', 'zh'
-              
+
     Returns:
-        LanguageRules for the specified language. Defaults to English if not found.
+        LanguageRules for the specified language.
+
+    Raises:
+        UnsupportedLanguageError: If no rules are registered for the language.
     """
-    normalized = (lang or "").lower().strip()
-    return _LANGUAGE_REGISTRY.get(normalized, english.rules)
+    _load_external_rules()
+    normalized = _normalize(lang)
+    try:
+        return _LANGUAGE_REGISTRY[normalized]
+    except KeyError:
+        message = (
+            f"No segmentation rules registered for language {lang!r}. "
+            f"Supported: {', '.join(list_supported_languages())}"
+        )
+        if _external_rule_errors:
+            message += f". Skipped rule sources: {'; '.join(_external_rule_errors)}"
+        raise UnsupportedLanguageError(message) from None
 
 
 def list_supported_languages() -> list[str]:
     """Return list of supported language identifiers.
-    
+
     Returns:
         Sorted list of all registered language codes and names.
     """
+    _load_external_rules()
     return sorted(_LANGUAGE_REGISTRY.keys())
 
 
-__all__ = ["get_rules", "list_supported_languages"]
-
+__all__ = [
+    "RULES_PATH_ENV",
+    "UnsupportedLanguageError",
+    "get_rules",
+    "list_supported_languages",
+    "register_rules",
+    "register_rules_file",
+]
@@ -0,0 +1,140 @@
+"""Loading language-specific segmentation rules from config files and entry points."""
+
+import json
+import sys
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Iterable, List, Mapping, Optional, Tuple
+
+from milvus_segment_generator.segmentation.base import LanguageRules
+
+# Entry point group third-party packages use to ship LanguageRules objects
+ENTRY_POINT_GROUP = "milvus_segment_generator.rules"
+
+RuleSpec = Tuple[LanguageRules, Tuple[str, ...]]
+
+
+def rules_from_dict(data: Mapping[str, Any]) -> RuleSpec:
+    """Build validated language rules and their aliases from a mapping.
+
+    Args:
+        data: Mapping with 'name', 'delimiters', optional 'merge_templates'
+            (lists of tokens, where "DELIM" stands for any delimiter) and
+            optional 'aliases'.
+
+    Returns:
+        Tuple of (LanguageRules, aliases).
+
+    Raises:
+        ValueError: If required keys are missing or values are invalid.
+    """
+    if not isinstance(data, Mapping):
+        raise ValueError(f"Rule definition must be a mapping, got {type(data).__name__}")
+
+    unknown = set(data) - {"name", "delimiters", "merge_templates", "aliases"}
+    if unknown:
+        raise ValueError(f"Unknown keys in rule definition: {sorted(unknown)}")
+    for key in ("name", "delimiters"):
+        if key not in data:
+            raise ValueError(f"Rule definition is missing required key {key!r}")
+
+    delimiters = data["delimiters"]
+    merge_templates = data.get("merge_templates", [])
+    aliases = data.get("aliases", [])
+    for key, value in (("delimiters", delimiters), ("merge_templates", merge_templates), ("aliases", aliases)):
+        if isinstance(value, str) or not isinstance(value, (list, tuple)):
+            raise ValueError(f"Rule definition key {key!r} must be a list")
+    for template in merge_templates:
+        if isinstance(template, str) or not isinstance(template, (list, tuple)):
+            raise ValueError(f"Merge template must be a list of tokens, got {template!r}")
+    for alias in aliases:
+        if not isinstance(alias, str) or not alias.strip():
+            raise ValueError(f"Invalid language alias: {alias!r}")
+
+    rules = LanguageRules(
+        name=data["name"],
+        delimiters=tuple(delimiters),
+        merge_templates=tuple(tuple(template) for template in merge_templates),
+    )
+    return rules, tuple(aliases)
+
+
+def load_rules_file(path: str | Path) -> List[RuleSpec]:
+    """Load and validate language rules from a JSON config file.
+
+    The file holds either a single rule definition or an object with a
+    'languages' list of definitions, e.g.::
+
+        {"languages": [{"name": "sanskrit", "aliases": ["sa"],
+                        "delimiters": ["|"], "merge_templates": []}]}
+
+    Args:
+        path: Path to the JSON config file.
+
+    Returns:
+        List of (LanguageRules, aliases) tuples.
+
+    Raises:
+        ValueError: If the file content is not a valid rule definition.
+    """
+    config_path = Path(path)
+    with config_path.open("r", encoding="utf-8") as handle:
+        data = json.load(handle)
+
+    definitions = data["languages"] if isinstance(data, dict) and "languages" in data else [data]
+    if not isinstance(definitions, list):
+        raise ValueError(f"'languages' in {config_path} must be a list")
+
+    specs: List[RuleSpec] = []
+    for definition in definitions:
+        try:
+            specs.append(rules_from_dict(definition))
+        except ValueError as exc:
+            raise ValueError(f"Invalid rule definition in {config_path}: {exc}") from exc
+    return specs
+
+
+def iter_entry_points() -> List[metadata.EntryPoint]:
+    """Return the entry points registered under ENTRY_POINT_GROUP."""
+    if sys.version_info >= (3, 10):
+        return list(metadata.entry_points(group=ENTRY_POINT_GROUP))
+    return list(metadata.entry_points().get(ENTRY_POINT_GROUP, []))
+
+
+def load_entry_point_rules(entry_points: Optional[Iterable[metadata.EntryPoint]] = None) -> List[RuleSpec]:
+    """Load language rules registered under the entry point group.
+
+    Each entry point must resolve to a LanguageRules object; the entry point
+    name is registered as an extra alias.
+
+    Args:
+        entry_points: Entry points to load (default: all of ENTRY_POINT_GROUP).
+
+    Returns:
+        List of (LanguageRules, aliases) tuples.
+
+    Raises:
+        ValueError: If an entry point does not resolve to LanguageRules.
+    """
+    if entry_points is None:
+        entry_points = iter_entry_points()
+
+    specs: List[RuleSpec] = []
+    for entry_point in entry_points:
+        rules = entry_point.load()
+        if not isinstance(rules, LanguageRules):
+            raise ValueError(
+                f"Entry point {entry_point.name!r} in {ENTRY_POINT_GROUP!r} must resolve "
+                f"to LanguageRules, got {type(rules).__name__}"
+            )
+        specs.append((rules, (entry_point.name,)))
+    return specs
+
+
+__all__ = [
+    "ENTRY_POINT_GROUP",
+    "iter_entry_points",
+    "load_entry_point_rules",
+    "load_rules_file",
+    "rules_from_dict",
+]
@@ -0,0 +1,188 @@
+"""Per-document profiling of segmentation hot spots."""
+
+import cProfile
+import heapq
+import io
+import json
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class SegmentationProfile:
+    """Collects costly regions and stage timings for one `segment_text` call.
+
+    Pass an instance as `segment_text(..., profile=profile)`, then read
+    `report()` or call `write_report(path)`.
+
+    The cost of a segment is the number of tokens scanned backward to find its
+    delimiter, plus its character length when it is oversized and has to be
+    split with UTF-8 binary searches.
+
+    Each chunking pass (a second one runs when segment_text falls back to
+    character tokens) gets its own summary and hot-spot list. A pass that
+    raises because a window has no delimiter records that window as
+    ``failed_window`` before the error propagates.
+
+    In sharded runs (workers > 1 or an executor), shards are tokenized and
+    post-processed in the pool, so that work appears only as the wall time
+    of the "shards" stage: cProfile and tracemalloc see the parent process
+    alone. Chunking passes are recorded in full as they run in the parent.
+
+    Attributes:
+        document_id: Optional identifier included in the report.
+        top_n: Number of costliest segments kept per chunking pass (0 keeps
+            only the pass summaries).
+        cprofile: Attach cProfile statistics (top functions by cumulative time).
+        tracemalloc: Attach tracemalloc peak memory and top allocation sites.
+    """
+
+    def __init__(
+        self,
+        document_id: Optional[str] = None,
+        top_n: int = 10,
+        cprofile: bool = False,
+        tracemalloc: bool = False,
+    ):
+        if top_n < 0:
+            raise ValueError("top_n must be a non-negative integer")
+        self.document_id = document_id
+        self.top_n = top_n
+        self.cprofile = cprofile
+        self.tracemalloc = tracemalloc
+        self.stages: Dict[str, float] = {}
+        self.passes: List[Dict[str, Any]] = []
+        self.total_seconds = 0.0
+        self.fallback_to_chars = False
+        self.cprofile_stats: Optional[str] = None
+        self.memory: Optional[Dict[str, Any]] = None
+        self._hotspots: List[List[Tuple[int, int, Dict[str, int]]]] = []
+
+    @contextmanager
+    def session(self) -> Iterator["SegmentationProfile"]:
+        """Time the whole run and optionally trace it with cProfile/tracemalloc."""
+        profiler = cProfile.Profile() if self.cprofile else None
+        started_tracing = False
+        if self.tracemalloc:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            elif hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+        if profiler is not None:
+            profiler.enable()
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.total_seconds = time.perf_counter() - started
+            if profiler is not None:
+                profiler.disable()
+                stream = io.StringIO()
+                pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(25)
+                self.cprofile_stats = stream.getvalue()
+            if self.tracemalloc:
+                current, peak = tracemalloc.get_traced_memory()
+                top = tracemalloc.take_snapshot().statistics("lineno")[:10]
+                self.memory = {
+                    "current_bytes": current,
+                    "peak_bytes": peak,
+                    "top": [str(stat) for stat in top],
+                }
+                if started_tracing:
+                    tracemalloc.stop()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Accumulate wall time spent in a named stage."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+
+    def start_pass(self, total_tokens: int, segment_size: int) -> None:
+        """Begin recording a chunking pass over total_tokens tokens."""
+        self.passes.append({
+            "tokens": total_tokens,
+            "segment_size": segment_size,
+            "segments": 0,
+            "scanned_tokens": 0,
+            "max_scan_length": 0,
+            "oversized_segments": 0,
+            "split_pieces": 0,
+            "failed_window": None,
+        })
+        self._hotspots.append([])
+
+    def record_failure(self, start_index: int) -> None:
+        """Record the window of the current pass in which no delimiter was found."""
+        current = self.passes[-1]
+        upper_bound = min(start_index + current["segment_size"], current["tokens"])
+        current["failed_window"] = {"start_token": start_index, "scan_length": upper_bound - start_index}
+
+    def record_segment(self, start_index: int, cut_index: int, char_length: int, split_count: int) -> None:
+        """Record one segment of the current pass."""
+        current = self.passes[-1]
+        upper_bound = min(start_index + current["segment_size"], current["tokens"])
+        scan_length = upper_bound - cut_index + 1
+        oversized = split_count > 1
+
+        current["segments"] += 1
+        current["scanned_tokens"] += scan_length
+        current["max_scan_length"] = max(current["max_scan_length"], scan_length)
+        if oversized:
+            current["oversized_segments"] += 1
+            current["split_pieces"] += split_count
+
+        if self.top_n == 0:
+            return
+        cost = scan_length + (char_length if oversized else 0)
+        hotspot = {
+            "start_token": start_index,
+            "end_token": cut_index,
+            "scan_length": scan_length,
+            "split_count": split_count,
+            "char_length": char_length,
+            "cost": cost,
+        }
+        heap = self._hotspots[-1]
+        entry = (cost, current["segments"], hotspot)
+        if len(heap) < self.top_n:
+            heapq.heappush(heap, entry)
+        elif cost > heap[0][0]:
+            heapq.heapreplace(heap, entry)
+
+    def report(self) -> Dict[str, Any]:
+        """Return the compact report as a JSON-serialisable dictionary."""
+        passes = []
+        for summary, heap in zip(self.passes, self._hotspots):
+            hotspots = [hotspot for _, _, hotspot in sorted(heap, key=lambda entry: (-entry[0], entry[1]))]
+            passes.append({**summary, "hotspots": hotspots})
+
+        report: Dict[str, Any] = {
+            "document_id": self.document_id,
+            "total_seconds": round(self.total_seconds, 6),
+            "fallback_to_chars": self.fallback_to_chars,
+            "stages": {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            "passes": passes,
+        }
+        if self.cprofile_stats is not None:
+            report["cprofile"] = self.cprofile_stats
+        if self.memory is not None:
+            report["memory"] = self.memory
+        return report
+
+    def write_report(self, path: str | Path) -> Path:
+        """Write the report as JSON and return the path."""
+        output_file = Path(path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        with output_file.open("w", encoding="utf-8") as handle:
+            json.dump(self.report(), handle, ensure_ascii=False, indent=4)
+        return output_file
+
+
+__all__ = ["SegmentationProfile"]
@@ -0,0 +1,179 @@
+"""Splitting one document into independent shards and stitching their cuts back together."""
+
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple
+
+from milvus_segment_generator.segmentation.base import (
+    LanguageRules,
+    _next_cut_index,
+    _no_delimiter_error,
+)
+
+if TYPE_CHECKING:
+    from milvus_segment_generator.segmentation.profiling import SegmentationProfile
+
+# Characters of context on each side of a candidate boundary passed to the boundary check tokenizer
+BOUNDARY_CONTEXT_CHARS = 64
+
+
+def _is_token_boundary(text: str, boundary: int, tokenize: Callable[[str], List[str]]) -> bool:
+    """Check that a shard starting at boundary tokenizes like the text around it.
+
+    Tokenizing the window around boundary must break exactly there, with the
+    decoded tokens before it reproducing the text (so tokens that decode to
+    other characters, e.g. partial UTF-8 bytes, reject it). Tokenizing from
+    boundary alone, as the shard worker does, must then give the window's
+    remaining tokens.
+    """
+    window_start = max(boundary - BOUNDARY_CONTEXT_CHARS, 0)
+    window_end = boundary + BOUNDARY_CONTEXT_CHARS
+    window = text[window_start:window_end]
+    target = boundary - window_start
+    window_tokens = tokenize(window)
+    split = 0
+    offset = 0
+    while split < len(window_tokens) and offset < target:
+        offset += len(window_tokens[split])
+        split += 1
+    if offset != target or "".join(window_tokens[:split]) != window[:target]:
+        return False
+    return window_tokens[split:] == tokenize(text[boundary:window_end])
+
+
+def _find_boundary(
+    text: str,
+    position: int,
+    rules: LanguageRules,
+    tokenize: Optional[Callable[[str], List[str]]] = None,
+) -> int:
+    """Return the first safe shard boundary at or after position, or -1 if none exists.
+
+    A boundary is safe when it directly follows a delimiter and the next
+    character is neither whitespace nor the start of a delimiter or merge
+    template token, so no merge pattern can span it. With tokenize, the
+    tokenizer must also break the surrounding text at the boundary, so no
+    token (e.g. ``.com`` or ``。”``) spans it.
+    """
+    unsafe_starts = rules.shard_unsafe_starts
+    for match in rules.delimiter_pattern.finditer(text, max(position - 1, 0)):
+        boundary = match.end()
+        if boundary >= len(text):
+            break
+        if text[boundary].isspace() or text.startswith(unsafe_starts, boundary):
+            continue
+        if tokenize is None or _is_token_boundary(text, boundary, tokenize):
+            return boundary
+    return -1
+
+
+def find_shard_bounds(
+    text: str,
+    rules: LanguageRules,
+    shard_chars: int,
+    tokenize: Optional[Callable[[str], List[str]]] = None,
+) -> List[Tuple[int, int]]:
+    """Split text into contiguous shards of roughly shard_chars characters at safe boundaries.
+
+    Args:
+        text: Input text to shard.
+        rules: Language rules specifying delimiters and merge templates.
+        shard_chars: Target number of characters per shard.
+        tokenize: Optional function returning decoded token strings for a
+            text (e.g. `decode_tokens`). When given, a candidate boundary is
+            only used if the tokenizer splits the BOUNDARY_CONTEXT_CHARS of
+            text on either side of it exactly there, and tokenizing from the
+            boundary alone gives the same tokens up to the end of that window.
+
+    Returns:
+        List of (start, end) character bounds covering the whole text. A single
+        shard is returned when no safe boundary exists.
+    """
+    if shard_chars <= 0:
+        raise ValueError("shard_chars must be a positive integer")
+
+    bounds: List[Tuple[int, int]] = []
+    cursor = 0
+    text_length = len(text)
+    while text_length - cursor > shard_chars:
+        boundary = _find_boundary(text, cursor + shard_chars, rules, tokenize)
+        if boundary == -1:
+            break
+        bounds.append((cursor, boundary))
+        cursor = boundary
+    bounds.append((cursor, text_length))
+    return bounds
+
+
+def find_shard_cut_indices(tokens: List[str], rules: LanguageRules, segment_size: int) -> List[int]:
+    """Greedy cut indices for a shard, stopping (not raising) where no delimiter is found.
+
+    The serial walk may never reach a window that fails here, so the error is
+    left to `stitch_cut_indices`, which raises it only if it is really hit.
+    """
+    cut_indices: List[int] = []
+    start_index = 0
+    while start_index < len(tokens):
+        cut_index = _next_cut_index(tokens, start_index, segment_size, rules.delimiters)
+        if cut_index is None:
+            break
+        cut_indices.append(cut_index)
+        start_index = cut_index
+    return cut_indices
+
+
+def stitch_cut_indices(
+    tokens: List[str],
+    shard_token_bounds: Sequence[Tuple[int, int]],
+    shard_cut_indices: Sequence[List[int]],
+    rules: LanguageRules,
+    segment_size: int,
+    profile: Optional["SegmentationProfile"] = None,
+) -> List[int]:
+    """Combine per-shard cut indices into exactly the cuts a serial pass would choose.
+
+    A shard's cut is reused when its whole search window lies inside that shard
+    (or the shard is the last one). Near shard boundaries the window is
+    searched again over the concatenated tokens until the walk lands on a
+    precomputed cut, after which both walks are identical.
+
+    Args:
+        tokens: Concatenated tokens of all shards.
+        shard_token_bounds: (start, end) token bounds of each shard in tokens.
+        shard_cut_indices: Shard-local cut indices from `find_shard_cut_indices`.
+        rules: Language rules specifying valid delimiters.
+        segment_size: Maximum number of tokens per segment.
+        profile: Optional SegmentationProfile of the current pass; records the
+            window without a delimiter before raising.
+
+    Returns:
+        Global cut indices, identical to those of `chunk_spans` on tokens.
+
+    Raises:
+        ValueError: If no delimiter is found within a window.
+    """
+    next_cut: Dict[int, int] = {}
+    last_shard = len(shard_token_bounds) - 1
+    for shard_index, ((shard_start, shard_end), local_cuts) in enumerate(zip(shard_token_bounds, shard_cut_indices)):
+        previous = shard_start
+        for local_cut in local_cuts:
+            global_cut = shard_start + local_cut
+            if shard_index == last_shard or previous + segment_size <= shard_end:
+                next_cut[previous] = global_cut
+            previous = global_cut
+
+    cut_indices: List[int] = []
+    start_index = 0
+    total_tokens = len(tokens)
+    while start_index < total_tokens:
+        cut_index: Optional[int] = next_cut.get(start_index)
+        if cut_index is None:
+            cut_index = _next_cut_index(tokens, start_index, segment_size, rules.delimiters)
+            if cut_index is None:
+                if profile is not None:
+                    profile.record_failure(start_index)
+                raise _no_delimiter_error(rules, segment_size, start_index)
+        cut_indices.append(cut_index)
+        start_index = cut_index
+    return cut_indices
+
+
+__all__ = ["BOUNDARY_CONTEXT_CHARS", "find_shard_bounds", "find_shard_cut_indices", "stitch_cut_indices"]
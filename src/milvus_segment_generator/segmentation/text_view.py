@@ -0,0 +1,78 @@
+"""Lazy, copy-free access to segment text via character spans."""
+
+from collections.abc import Sequence
+from typing import IO, Iterator, List, Union
+
+
+class SegmentTextView(Sequence):
+    """Read-only sequence of segment strings sliced from the source text on demand.
+
+    Holds references to the original text and spans only, so no segment copy
+    exists until an item is accessed.
+
+    Attributes:
+        text: Source text the spans index into.
+        spans: Span dictionaries with 'start' and 'end' character offsets.
+    """
+
+    def __init__(self, text: str, spans: List[dict]):
+        self.text = text
+        self.spans = spans
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, "SegmentTextView"]:
+        if isinstance(index, slice):
+            return SegmentTextView(self.text, self.spans[index])
+        span = self.spans[index]["span"]
+        return self.text[span["start"]:span["end"]]
+
+    def __iter__(self) -> Iterator[str]:
+        text = self.text
+        for item in self.spans:
+            span = item["span"]
+            yield text[span["start"]:span["end"]]
+
+    def __repr__(self) -> str:
+        return f"SegmentTextView(segments={len(self.spans)}, chars={len(self.text)})"
+
+    def __str__(self) -> str:
+        """Materialise the newline-joined segment text (same as chunk_spans output)."""
+        return "\n".join(self)
+
+    def write_to(self, handle: IO[str], separator: str = "\n") -> int:
+        """Stream the separator-joined segments to a text file handle.
+
+        Args:
+            handle: Writable text file object.
+            separator: String written between segments (default: newline).
+
+        Returns:
+            Number of characters written.
+        """
+        return write_segmented_text(self.text, self.spans, handle, separator)
+
+
+def write_segmented_text(text: str, spans: List[dict], handle: IO[str], separator: str = "\n") -> int:
+    """Write segments of text, joined by separator, without building the joined string.
+
+    Args:
+        text: Source text the spans index into.
+        spans: Span dictionaries with 'start' and 'end' character offsets.
+        handle: Writable text file object.
+        separator: String written between segments (default: newline).
+
+    Returns:
+        Number of characters written.
+    """
+    written = 0
+    for index, item in enumerate(spans):
+        if index:
+            written += handle.write(separator)
+        span = item["span"]
+        written += handle.write(text[span["start"]:span["end"]])
+    return written
+
+
+__all__ = ["SegmentTextView", "write_segmented_text"]
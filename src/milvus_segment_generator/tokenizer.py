@@ -1,7 +1,7 @@
 """Gemma tokenizer service for all languages using transformers."""
 
 from functools import lru_cache
-from typing import List
+from typing import List, Tuple
 import os
 try:
     from transformers import AutoTokenizer
@@ -27,26 +27,24 @@ def _get_gemma_tokenizer():
     return tokenizer
 
 
-def tokenize(text: str, rules) -> List[str]:
+def tokenize(text: str, rules) -> Tuple[List[str], bool]:
     """Tokenize text with the Gemma tokenizer, returning decoded token strings.
     
     Args:
         text: Input text to tokenize.
         
     Returns:
-        List of decoded token strings (each token decoded individually).
+        Tuple of (tokens, has_delimiter): decoded token strings (each token
+        decoded individually), with a delimiter appended if has_delimiter is False.
     """
-    tokenizer = _get_gemma_tokenizer()
-    # Decode each token ID individually to get the token string
-
-    tokens = tokenizer.batch_decode(tokenizer.encode(text,add_special_tokens=False),skip_special_tokens=True)
+    tokens = decode_tokens(text)
 
     tokens, has_delimiter = delimiter_check(tokens, rules)
 
     return tokens, has_delimiter
 
-def tokenize_with_char(text: str, rules) -> List[str]:
-    """Tokenize text with the Gemma tokenizer, returning decoded token strings.
+def decode_tokens(text: str) -> List[str]:
+    """Tokenize text with the Gemma tokenizer without the trailing delimiter check.
     
     Args:
         text: Input text to tokenize.
@@ -54,12 +52,26 @@ def tokenize_with_char(text: str, rules) -> List[str]:
     Returns:
         List of decoded token strings (each token decoded individually).
     """
+    tokenizer = _get_gemma_tokenizer()
+    # Decode each token ID individually to get the token string
+    return tokenizer.batch_decode(tokenizer.encode(text,add_special_tokens=False),skip_special_tokens=True)
+
+def tokenize_with_char(text: str, rules) -> Tuple[List[str], bool]:
+    """Tokenize text with the Gemma tokenizer, returning decoded token strings.
+    
+    Args:
+        text: Input text to tokenize.
+        
+    Returns:
+        Tuple of (tokens, has_delimiter): character tokens, with a delimiter
+        appended if has_delimiter is False.
+    """
     tokens = [char for char in text]
     tokens, has_delimiter = delimiter_check(tokens, rules)  
     return tokens, has_delimiter
 
 
-def delimiter_check(tokens: List[str], rules) -> List[str]:
+def delimiter_check(tokens: List[str], rules) -> Tuple[List[str], bool]:
     has_delimiter = True
     if tokens[-1] not in rules.delimiters:
         tokens.append(rules.delimiters[0])
@@ -0,0 +1,14 @@
+"""Shared fixtures for the test suite."""
+
+import pytest
+
+from milvus_segment_generator import tokenizer
+from tests.stubs import StubTokenizer
+
+
+@pytest.fixture
+def stub_tokenizer(monkeypatch):
+    """Replace the Gemma tokenizer with `StubTokenizer` for the test."""
+    stub = StubTokenizer()
+    monkeypatch.setattr(tokenizer, "_get_gemma_tokenizer", lambda: stub)
+    return stub
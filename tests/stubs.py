@@ -0,0 +1,31 @@
+"""Offline test doubles shared by the test suite."""
+
+import re
+
+
+class StubTokenizer:
+    """Offline stand-in for the Gemma tokenizer.
+
+    Splits text into runs of up to three word characters, single whitespace
+    characters and single other characters. "IDs" are the token strings
+    themselves, so decoding is lossless.
+
+    With glue_punctuation=True, punctuation is also glued to the following
+    characters the way subword tokenizers do (``.com``, ``。”``, ``།ཀ``), so
+    tokens span a delimiter followed by a non-space character.
+    """
+
+    _TOKEN_PATTERN = re.compile(r"\w{1,3}|\s|.", re.DOTALL)
+    _GLUED_TOKEN_PATTERN = re.compile(r"\.com|。”|[།༎༔][ཀ-ྼ]|\w{1,3}|\s|.", re.DOTALL)
+
+    def __init__(self, glue_punctuation=False):
+        self._pattern = self._GLUED_TOKEN_PATTERN if glue_punctuation else self._TOKEN_PATTERN
+
+    def encode(self, text, add_special_tokens=False):
+        return self._pattern.findall(text)
+
+    def batch_decode(self, ids, skip_special_tokens=True):
+        return list(ids)
+
+
+__all__ = ["StubTokenizer"]
@@ -0,0 +1,246 @@
+"""Differential tests: active segmentation functions against frozen reference copies.
+
+Token sequences are generated from seeded random sources so failures are
+reproducible. Each case compares the full outcome (result or raised error)
+of the reference and active implementation.
+"""
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from milvus_segment_generator import tokenizer
+from milvus_segment_generator.document import TokenizedDocument
+from milvus_segment_generator.segment import segment_text
+from milvus_segment_generator.segmentation.base import (
+    MAX_SEGMENT_UTF8_BYTES,
+    _split_segment_text,
+    chunk_spans,
+    post_process_tokens,
+)
+from milvus_segment_generator.segmentation.rules import tibetan, english, chinese
+from tests import reference_impl as reference
+from tests.stubs import StubTokenizer
+
+
+SEEDS = range(60)
+RULES = [tibetan.rules, english.rules, chinese.rules]
+
+WORD_TOKENS = [
+    # Tibetan (multibyte, combining marks, tsheg)
+    "ཤ", "ཱ", "་", "རི", "འི", "བུ", "གཟུགས", "མེད", "ཚོར", "སྟ", "ོང",
+    # English subwords
+    "The", "quick", "jump", "s", "la", "zy", "dog", "happen", "ed",
+    # Chinese characters
+    "我", "爱", "中", "国", "测", "试",
+    # 4-byte characters and whitespace
+    "😀", "𠀀", " ", "\n", "\t",
+]
+
+# Delimiters glued to following characters, tokenized as one token by the glue_punctuation stub
+GLUED_PUNCTUATION = [".com", "。”", "།ཀ", "༔ཁ", ".co", "。x"]
+
+
+def _outcome(func, *args, **kwargs):
+    """Return ('ok', result) or ('error', type, message) for a call."""
+    try:
+        return ("ok", func(*args, **kwargs))
+    except ValueError as exc:
+        return ("error", type(exc), str(exc))
+
+
+def generate_tokens(rng: random.Random, rules, length: int):
+    """Generate a mixed-script token sequence with delimiters and merge patterns."""
+    delimiters = list(rules.delimiters)
+    all_delimiters = [d for r in RULES for d in r.delimiters]
+    tokens = []
+    while len(tokens) < length:
+        roll = rng.random()
+        delimiter = rng.choice(delimiters)
+        if roll < 0.55:
+            tokens.append(rng.choice(WORD_TOKENS))
+        elif roll < 0.70:
+            tokens.append(delimiter)
+        elif roll < 0.78:
+            # Token ending with a delimiter (delimiter glued to a word)
+            tokens.append(rng.choice(WORD_TOKENS) + delimiter)
+        elif roll < 0.84:
+            tokens.extend([delimiter, " ", rng.choice([delimiter, rng.choice(delimiters)])])
+        elif roll < 0.88:
+            tokens.extend([delimiter, delimiter, " ", delimiter, delimiter])
+        elif roll < 0.92:
+            # Partial merge patterns
+            tokens.extend(rng.choice([[delimiter, " "], [delimiter, delimiter, " ", delimiter]]))
+        elif roll < 0.96:
+            # Delimiters of other languages
+            tokens.append(rng.choice(all_delimiters))
+        else:
+            tokens.append("".join(rng.choice(WORD_TOKENS) for _ in range(rng.randint(2, 12))))
+    return tokens
+
+
+def generate_text(rng: random.Random, rules, length: int, glued: bool = False) -> str:
+    tokens = generate_tokens(rng, rules, length)
+    if glued:
+        tokens = [token + rng.choice(GLUED_PUNCTUATION) if rng.random() < 0.15 else token for token in tokens]
+    return "".join(tokens)
+
+
+def with_trailing_delimiter(tokens, rules):
+    """Mirror `delimiter_check`: append a delimiter if the last token is not one."""
+    tokens = list(tokens)
+    has_delimiter = bool(tokens) and tokens[-1] in rules.delimiters
+    if tokens and not has_delimiter:
+        tokens.append(rules.delimiters[0])
+    return tokens, has_delimiter or not tokens
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("rules", RULES, ids=lambda rules: rules.name)
+def test_post_process_tokens_equivalence(seed, rules):
+    """Active post_process_tokens matches the reference on generated tokens."""
+    rng = random.Random(seed)
+    tokens = generate_tokens(rng, rules, rng.randint(0, 300))
+
+    assert post_process_tokens(list(tokens), rules) == reference.post_process_tokens(list(tokens), rules)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("rules", RULES, ids=lambda rules: rules.name)
+def test_chunk_spans_equivalence(seed, rules):
+    """Active chunk_spans matches the reference, including has_delimiter=False and errors."""
+    rng = random.Random(seed)
+    tokens = generate_tokens(rng, rules, rng.randint(0, 300))
+    tokens = reference.post_process_tokens(tokens, rules)
+    tokens, has_delimiter = with_trailing_delimiter(tokens, rules)
+    if rng.random() < 0.3:
+        has_delimiter = False
+    segment_size = rng.randint(1, 40)
+
+    expected = _outcome(reference.chunk_spans, list(tokens), rules, segment_size, has_delimiter)
+    actual = _outcome(chunk_spans, list(tokens), rules, segment_size, has_delimiter)
+    document = TokenizedDocument.from_tokens(tokens, rules, has_delimiter)
+
+    assert actual == expected
+    assert _outcome(document.chunk, segment_size) == expected
+    if expected[0] == "ok":
+        assert chunk_spans(list(tokens), rules, segment_size, has_delimiter, with_text=False) == (expected[1][0], None)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_split_segment_text_equivalence(seed):
+    """Active _split_segment_text matches the reference with small char/byte limits."""
+    rng = random.Random(seed)
+    rules = rng.choice(RULES)
+    text = generate_text(rng, rules, rng.randint(1, 200))
+    max_chars = rng.randint(1, 60)
+    max_bytes = rng.randint(4, 120)
+
+    expected = reference._split_segment_text(text, rules.delimiters, max_chars, max_bytes)
+
+    assert _split_segment_text(text, rules.delimiters, max_chars, max_bytes) == expected
+    assert _split_segment_text(text, rules.delimiter_set, max_chars, max_bytes) == expected
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_chunk_spans_oversized_multibyte_equivalence(seed):
+    """Oversized segments split at UTF-8 byte limits match the reference."""
+    rng = random.Random(seed)
+    rules = rng.choice(RULES)
+    filler = rng.choice(["a", "ཀ", "中", "😀"])
+    # Land close to the byte limit so splits fall on multibyte boundaries
+    repeat = MAX_SEGMENT_UTF8_BYTES // len(filler.encode("utf-8")) + rng.randint(-3, 3)
+    tokens = generate_tokens(rng, rules, 20) + [filler * repeat, " ", "x" * rng.randint(0, 5)]
+    tokens += generate_tokens(rng, rules, 20)
+    tokens, has_delimiter = with_trailing_delimiter(tokens, rules)
+
+    expected = _outcome(reference.chunk_spans, list(tokens), rules, 100, has_delimiter)
+
+    assert _outcome(chunk_spans, list(tokens), rules, 100, has_delimiter) == expected
+    assert _outcome(TokenizedDocument.from_tokens(tokens, rules, has_delimiter).chunk, 100) == expected
+
+
+def _lazy_outcome(text, lang, segment_size, **kwargs):
+    """segment_text with lazy_text=True, with the view joined for comparison."""
+    spans, view = segment_text(text, lang, segment_size, lazy_text=True, **kwargs)
+    return spans, str(view)
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("glue_punctuation", [False, True], ids=["plain", "glued"])
+def test_segment_text_equivalence(monkeypatch, seed, glue_punctuation):
+    """segment_text (serial, sharded and lazy) matches the reference pipeline.
+
+    The glued stub emits tokens spanning a delimiter and the next character,
+    which sharding must not cut.
+    """
+    stub = StubTokenizer(glue_punctuation=glue_punctuation)
+    monkeypatch.setattr(tokenizer, "_get_gemma_tokenizer", lambda: stub)
+    rng = random.Random(seed)
+    rules = rng.choice(RULES)
+    text = generate_text(rng, rules, rng.randint(1, 400), glued=glue_punctuation)
+    segment_size = rng.randint(20, 200)
+    shard_chars = rng.randint(10, 80)
+
+    expected = _outcome(reference.segment_text, text, rules, stub, segment_size)
+
+    assert _outcome(segment_text, text, rules.name, segment_size) == expected
+    assert _outcome(_lazy_outcome, text, rules.name, segment_size) == expected
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        sharded = _outcome(segment_text, text, rules.name, segment_size, shard_chars=shard_chars, executor=executor)
+        lazy_sharded = _outcome(
+            _lazy_outcome, text, rules.name, segment_size, shard_chars=shard_chars, executor=executor
+        )
+    assert sharded == expected
+    assert lazy_sharded == expected
+    assert _outcome(lambda: TokenizedDocument.from_text(text, rules.name).chunk(segment_size)) == expected
+
+
+def _best_of(func, repeats=3):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def test_timing_comparison(record_property):
+    """Time reference and active implementations on the same generated input.
+
+    Timings are reported with ``record_property`` (e.g. in ``--junitxml``
+    output); equality is the only assertion so the test is not sensitive to
+    machine load.
+    """
+    rng = random.Random(1234)
+    rules = tibetan.rules
+    tokens = generate_tokens(rng, rules, 200_000)
+    merged = post_process_tokens(list(tokens), rules)
+    tokens_with_delimiter, has_delimiter = with_trailing_delimiter(merged, rules)
+    document = TokenizedDocument.from_tokens(tokens_with_delimiter, rules, has_delimiter)
+    assert merged == reference.post_process_tokens(list(tokens), rules)
+    expected_chunks = reference.chunk_spans(tokens_with_delimiter, rules, 1990, has_delimiter)
+    assert chunk_spans(tokens_with_delimiter, rules, 1990, has_delimiter) == expected_chunks
+    assert document.chunk(1990) == expected_chunks
+
+    cases = {
+        "post_process_tokens": (
+            lambda: reference.post_process_tokens(tokens, rules),
+            lambda: post_process_tokens(tokens, rules),
+        ),
+        "chunk_spans": (
+            lambda: reference.chunk_spans(tokens_with_delimiter, rules, 1990, has_delimiter),
+            lambda: chunk_spans(tokens_with_delimiter, rules, 1990, has_delimiter),
+        ),
+        "TokenizedDocument.chunk": (
+            lambda: reference.chunk_spans(tokens_with_delimiter, rules, 1990, has_delimiter),
+            lambda: document.chunk(1990),
+        ),
+    }
+    for name, (reference_func, active_func) in cases.items():
+        reference_time = _best_of(reference_func)
+        active_time = _best_of(active_func)
+        record_property(f"{name}_reference_seconds", reference_time)
+        record_property(f"{name}_active_seconds", active_time)
@@ -0,0 +1,134 @@
+"""Tests for sharded (parallel) segmentation of a single document."""
+
+import multiprocessing
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from milvus_segment_generator.segment import segment_text
+from milvus_segment_generator.segmentation.base import _find_cut_indices
+from milvus_segment_generator.segmentation.rules import tibetan, english, chinese
+from milvus_segment_generator.segmentation.sharding import (
+    find_shard_bounds,
+    find_shard_cut_indices,
+    stitch_cut_indices,
+)
+
+
+TIBETAN_TEXT = (
+    "༄༅། །བཅོམ་ལྡན་འདས་མ་ཤེས་རབ་ཀྱི་ཕ་རོལ་ཏུ་ཕྱིན་པའི་སྙིང་པོ། །"
+    "ཤཱ་རིའི་བུ།དེ་ལྟ་བས་ན་སྟོང་པ་ཉིད་ལ་གཟུགས་མེད།ཚོར་བ་མེད།"
+    "འདུ་ཤེས་མེད༔འདུ་བྱེད་རྣམས་མེད། རྣམ་པར་ཤེས་པ་མེད༎མིག་མེད།"
+) * 40
+
+
+class TestShardBounds:
+    """Test choosing safe shard boundaries."""
+
+    def test_bounds_cover_text_contiguously(self):
+        """Shards are contiguous and cover the whole text."""
+        bounds = find_shard_bounds(TIBETAN_TEXT, tibetan.rules, shard_chars=200)
+        assert len(bounds) > 1
+        assert bounds[0][0] == 0
+        assert bounds[-1][1] == len(TIBETAN_TEXT)
+        assert all(end == next_start for (_, end), (next_start, _) in zip(bounds, bounds[1:]))
+
+    def test_boundaries_follow_delimiter_without_space(self):
+        """Boundaries never split a delimiter from a following space or delimiter."""
+        for _, end in find_shard_bounds(TIBETAN_TEXT, tibetan.rules, shard_chars=50)[:-1]:
+            assert TIBETAN_TEXT[end - 1] in tibetan.rules.delimiters
+            assert not TIBETAN_TEXT[end].isspace()
+            assert TIBETAN_TEXT[end] not in tibetan.rules.delimiters
+
+    @pytest.mark.parametrize(
+        ("text", "rules", "glued"),
+        [("Visit google.com now.Go " * 10, english.rules, ".com"), ("他说“好。”我们走。他" * 10, chinese.rules, "。”")],
+    )
+    def test_tokenizer_rejects_boundaries_inside_tokens(self, text, rules, glued):
+        """Candidate boundaries that the tokenizer does not break at are skipped."""
+        tokenize = re.compile(r"\.com|。”|\w+|.", re.DOTALL).findall
+
+        def glued_at(bounds):
+            return any(text.startswith(glued, end - 1) for _, end in bounds[:-1])
+
+        assert glued_at(find_shard_bounds(text, rules, shard_chars=5))
+        bounds = find_shard_bounds(text, rules, shard_chars=5, tokenize=tokenize)
+        assert len(bounds) > 1
+        assert not glued_at(bounds)
+
+    def test_tokenizer_rejects_boundaries_with_different_start_of_input(self):
+        """Boundaries are skipped when a shard tokenized from its start differs from the whole text."""
+        text = "Visit google.com now.Go " * 10
+        pattern = re.compile(r"\w+|.", re.DOTALL)
+
+        def start_glued(text):
+            # Glues the first two tokens of its input, like a start-of-input prefix token
+            tokens = pattern.findall(text)
+            return [tokens[0] + tokens[1]] + tokens[2:]
+
+        assert len(find_shard_bounds(text, english.rules, shard_chars=5, tokenize=pattern.findall)) > 1
+        assert find_shard_bounds(text, english.rules, shard_chars=5, tokenize=start_glued) == [(0, len(text))]
+
+    def test_no_safe_boundary_gives_single_shard(self):
+        """Text without a safe boundary stays in one shard."""
+        text = "One. Two. Three. Four."
+        assert find_shard_bounds(text, english.rules, shard_chars=5) == [(0, len(text))]
+
+
+@pytest.mark.parametrize("segment_size", [5, 7, 20, 64])
+def test_stitched_cuts_match_serial(segment_size):
+    """Stitching per-shard cuts reproduces the serial cuts exactly."""
+    tokens = ["a", "b", "."] * 30 + ["c", "d", "e", "f", "!"] * 20
+    shard_token_bounds = [(0, 41), (41, 97), (97, len(tokens))]
+    shard_cuts = [
+        find_shard_cut_indices(tokens[start:end], english.rules, segment_size)
+        for start, end in shard_token_bounds
+    ]
+
+    stitched = stitch_cut_indices(tokens, shard_token_bounds, shard_cuts, english.rules, segment_size)
+
+    assert stitched == _find_cut_indices(tokens, english.rules, segment_size)
+
+
+def test_stitch_raises_when_serial_walk_has_no_delimiter():
+    """A window without delimiters still raises after stitching."""
+    tokens = ["a", "."] + ["b"] * 10 + ["."]
+    shard_token_bounds = [(0, 2), (2, len(tokens))]
+    shard_cuts = [find_shard_cut_indices(tokens[start:end], english.rules, 4) for start, end in shard_token_bounds]
+    with pytest.raises(ValueError, match="Unable to find a delimiter"):
+        stitch_cut_indices(tokens, shard_token_bounds, shard_cuts, english.rules, 4)
+
+
+@pytest.mark.parametrize("segment_size", [60, 90, 400])
+@pytest.mark.parametrize("shard_chars", [40, 300])
+def test_sharded_segment_text_matches_serial(stub_tokenizer, segment_size, shard_chars):
+    """Parallel segmentation output is identical to serial output."""
+    expected = segment_text(TIBETAN_TEXT, "bo", segment_size=segment_size)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        result = segment_text(
+            TIBETAN_TEXT, "bo", segment_size=segment_size, shard_chars=shard_chars, executor=executor
+        )
+
+    assert result == expected
+
+
+def test_sharded_segment_text_without_trailing_delimiter(stub_tokenizer):
+    """The appended delimiter is only added (and trimmed) for the last shard."""
+    text = TIBETAN_TEXT + "ཀ་ཁ"
+    expected = segment_text(text, "bo", segment_size=90)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        result = segment_text(text, "bo", segment_size=90, shard_chars=100, executor=executor)
+
+    assert result == expected
+    assert result[0][-1]["span"]["end"] == len(text)
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="workers inherit the stub tokenizer via fork")
+def test_workers_use_process_pool(stub_tokenizer):
+    """workers > 1 without an executor runs shards on a new process pool."""
+    expected = segment_text(TIBETAN_TEXT, "bo", segment_size=90)
+
+    assert segment_text(TIBETAN_TEXT, "bo", segment_size=90, workers=2, shard_chars=300) == expected
@@ -0,0 +1,131 @@
+"""Tests for segmentation profiling reports."""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from milvus_segment_generator.document import TokenizedDocument
+from milvus_segment_generator.segment import segment_text
+from milvus_segment_generator.segmentation.base import chunk_spans, MAX_SEGMENT_CHAR_SPAN
+from milvus_segment_generator.segmentation.profiling import SegmentationProfile
+from milvus_segment_generator.segmentation.rules import english
+
+
+def test_profile_ranks_delimiter_sparse_region_first():
+    """A window with its only delimiter near the start has the longest backward scan."""
+    tokens = ["a", "."] * 5 + ["b", "."] + ["c"] * 8 + ["."]
+    profile = SegmentationProfile(top_n=3)
+
+    spans, _ = chunk_spans(tokens, english.rules, segment_size=10, has_delimiter=True, profile=profile)
+
+    summary = profile.report()["passes"][0]
+    assert summary["segments"] == len(spans)
+    assert summary["tokens"] == len(tokens)
+    assert len(summary["hotspots"]) == 3
+    worst = summary["hotspots"][0]
+    # Window [10, 20) only has a delimiter at index 11, so 9 tokens are scanned
+    assert worst == {
+        "start_token": 10,
+        "end_token": 12,
+        "scan_length": 9,
+        "split_count": 1,
+        "char_length": 2,
+        "cost": 9,
+    }
+    assert summary["max_scan_length"] == 9
+
+
+def test_profile_records_oversized_segment_splits():
+    """Oversized segments report their split count and character length."""
+    long_token = "a" * (MAX_SEGMENT_CHAR_SPAN + 100)
+    profile = SegmentationProfile()
+
+    chunk_spans([long_token, "."], english.rules, segment_size=10, has_delimiter=True, profile=profile)
+
+    summary = profile.report()["passes"][0]
+    assert summary["oversized_segments"] == 1
+    assert summary["split_pieces"] == 2
+    assert summary["hotspots"][0]["split_count"] == 2
+    assert summary["hotspots"][0]["char_length"] == len(long_token) + 1
+
+
+def test_segment_text_profile_report(stub_tokenizer, tmp_path):
+    """segment_text fills stage timings and optional cProfile/tracemalloc data."""
+    text = "The quick brown fox. It jumps over! The lazy dog? " * 20
+    profile = SegmentationProfile(document_id="doc-1", cprofile=True, tracemalloc=True)
+
+    expected = segment_text(text, "en", segment_size=30)
+    result = segment_text(text, "en", segment_size=30, profile=profile)
+    report = profile.report()
+
+    assert result == expected
+    assert report["document_id"] == "doc-1"
+    assert report["fallback_to_chars"] is False
+    assert set(report["stages"]) == {"tokenize", "post_process", "chunk"}
+    assert report["passes"][0]["segments"] == len(result[0])
+    assert "chunk_spans" in report["cprofile"]
+    assert report["memory"]["peak_bytes"] > 0
+
+    path = profile.write_report(tmp_path / "reports" / "doc-1.json")
+    assert json.loads(path.read_text(encoding="utf-8"))["document_id"] == "doc-1"
+
+
+def test_sharded_profile_matches_serial_pass(stub_tokenizer):
+    """Sharded runs report the same per-segment costs as serial runs."""
+    text = "Alpha.Beta gamma.Delta epsilon zeta.Eta!" * 30
+    serial_profile = SegmentationProfile()
+    sharded_profile = SegmentationProfile()
+
+    segment_text(text, "en", segment_size=12, profile=serial_profile)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        segment_text(text, "en", segment_size=12, shard_chars=100, executor=executor, profile=sharded_profile)
+
+    assert sharded_profile.report()["passes"] == serial_profile.report()["passes"]
+    assert "shards" in sharded_profile.report()["stages"]
+
+
+def test_profile_records_failed_window():
+    """A window without a delimiter is recorded in the report before the error is raised."""
+    tokens = ["a", "."] + ["b"] * 12 + ["."]
+    document = TokenizedDocument.from_tokens(tokens, english.rules, has_delimiter=True)
+    expected = {"start_token": 2, "scan_length": 5}
+
+    for chunk in (
+        lambda profile: chunk_spans(tokens, english.rules, segment_size=5, has_delimiter=True, profile=profile),
+        lambda profile: document.chunk(5, profile=profile),
+    ):
+        profile = SegmentationProfile()
+        with pytest.raises(ValueError, match="Unable to find a delimiter"):
+            chunk(profile)
+        summary = profile.report()["passes"][0]
+        assert summary["failed_window"] == expected
+        assert summary["tokens"] == len(tokens)
+
+
+def test_sharded_profile_records_failed_window(stub_tokenizer):
+    """Sharded runs record the same failed window as serial runs."""
+    text = "Alpha.Beta gamma.Delta epsilon zeta.Eta!" * 10 + "word " * 20 + "end."
+    serial_profile = SegmentationProfile()
+    sharded_profile = SegmentationProfile()
+
+    with pytest.raises(ValueError):
+        segment_text(text, "en", segment_size=12, profile=serial_profile)
+    with ThreadPoolExecutor(max_workers=2) as executor, pytest.raises(ValueError):
+        segment_text(text, "en", segment_size=12, shard_chars=100, executor=executor, profile=sharded_profile)
+
+    assert serial_profile.report()["passes"][0]["failed_window"] is not None
+    assert sharded_profile.report()["passes"] == serial_profile.report()["passes"]
+
+
+def test_profile_top_n_zero_keeps_summaries_only():
+    """top_n=0 records pass summaries without hot spots; negative values are rejected."""
+    profile = SegmentationProfile(top_n=0)
+
+    chunk_spans(["a", ".", "b", "."], english.rules, segment_size=2, has_delimiter=True, profile=profile)
+
+    summary = profile.report()["passes"][0]
+    assert summary["segments"] == 2
+    assert summary["hotspots"] == []
+    with pytest.raises(ValueError, match="top_n"):
+        SegmentationProfile(top_n=-1)
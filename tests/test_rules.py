@@ -0,0 +1,249 @@
+"""Tests for language rule validation, loading and lookup."""
+
+import json
+import os
+
+import pytest
+
+from milvus_segment_generator.segmentation import factory
+from milvus_segment_generator.segmentation.base import ANY_DELIM, LanguageRules, post_process_tokens
+from milvus_segment_generator.segmentation.factory import (
+    UnsupportedLanguageError,
+    get_rules,
+    register_rules,
+    register_rules_file,
+)
+from milvus_segment_generator.segmentation.loader import load_rules_file, rules_from_dict
+from milvus_segment_generator.segmentation.rules import tibetan, english
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Isolate registry changes made by a test."""
+    monkeypatch.setattr(factory, "_LANGUAGE_REGISTRY", dict(factory._LANGUAGE_REGISTRY))
+    return factory._LANGUAGE_REGISTRY
+
+
+@pytest.fixture
+def external_rules(monkeypatch, registry):
+    """Force external rule sources to be loaded again on the next lookup."""
+    monkeypatch.setattr(factory, "_external_rules_loaded", False)
+    monkeypatch.setattr(factory, "_external_rule_errors", {})
+    monkeypatch.setattr(factory, "iter_entry_points", lambda: [])
+    return monkeypatch
+
+
+class BrokenEntryPoint:
+    """Entry point whose package fails to import."""
+
+    name = "broken"
+
+    def load(self):
+        raise ImportError("No module named 'broken_rules'")
+
+
+class TestLanguageRulesValidation:
+    """Test validation performed when LanguageRules are created."""
+
+    @pytest.mark.parametrize(
+        ("kwargs", "message"),
+        [
+            ({"name": "", "delimiters": ("。",)}, "name"),
+            ({"name": "x", "delimiters": ()}, "at least one delimiter"),
+            ({"name": "x", "delimiters": ("",)}, "invalid delimiter"),
+            ({"name": "x", "delimiters": ("||", "|")}, "single characters"),
+            ({"name": "x", "delimiters": (".",), "merge_templates": ((),)}, "empty merge template"),
+            ({"name": "x", "delimiters": (".",), "merge_templates": ((ANY_DELIM, ""),)}, "merge template token"),
+        ],
+    )
+    def test_invalid_rules_rejected(self, kwargs, message):
+        """Invalid definitions should fail when the rules are built."""
+        with pytest.raises(ValueError, match=message):
+            LanguageRules(**kwargs)
+
+    def test_lists_normalised_to_tuples(self):
+        """List input (e.g. from JSON) should be stored as tuples."""
+        rules = LanguageRules(name="x", delimiters=["."], merge_templates=[[ANY_DELIM, " ", ANY_DELIM]])
+        assert rules.delimiters == (".",)
+        assert rules.merge_templates == ((ANY_DELIM, " ", ANY_DELIM),)
+        assert hash(rules) == hash(LanguageRules(name="x", delimiters=(".",),
+                                                 merge_templates=((ANY_DELIM, " ", ANY_DELIM),)))
+
+    def test_compiled_matchers_cached_per_instance(self):
+        """Delimiter sets and merge indexes are built once and reused."""
+        assert tibetan.rules.delimiter_set is tibetan.rules.delimiter_set
+        assert tibetan.rules.merge_index is tibetan.rules.merge_index
+        assert tibetan.rules.delimiter_set == frozenset(tibetan.rules.delimiters)
+        assert english.rules.merge_index == {}
+
+    def test_shard_matchers_cached_per_instance(self):
+        """The delimiter regex and unsafe shard starts are built once per rules object."""
+        assert tibetan.rules.delimiter_pattern is tibetan.rules.delimiter_pattern
+        assert [match.group() for match in english.rules.delimiter_pattern.finditer("a.b!c?")] == [".", "!", "?"]
+        assert set(tibetan.rules.shard_unsafe_starts) == set(tibetan.rules.delimiters) | {" "}
+
+    def test_merge_index_preserves_pattern_priority(self):
+        """Patterns sharing a first token keep their template order."""
+        entries = tibetan.rules.merge_index["།"]
+        assert [pattern for pattern, _ in entries] == [("།", " ", "།"), ("།", "།", " ", "།", "།")]
+        assert [merged for _, merged in entries] == ["། །", "།། །།"]
+
+
+class TestRuleLoading:
+    """Test loading rules from mappings and config files."""
+
+    def test_rules_from_dict(self):
+        """A complete mapping should produce rules and aliases."""
+        rules, aliases = rules_from_dict({
+            "name": "sanskrit",
+            "aliases": ["sa", "san"],
+            "delimiters": ["|", "॥"],
+            "merge_templates": [["DELIM", " ", "DELIM"]],
+        })
+        assert rules == LanguageRules("sanskrit", ("|", "॥"), ((ANY_DELIM, " ", ANY_DELIM),))
+        assert aliases == ("sa", "san")
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {"delimiters": ["|"]},
+            {"name": "x"},
+            {"name": "x", "delimiters": "|"},
+            {"name": "x", "delimiters": ["|"], "merge_templates": ["DELIM"]},
+            {"name": "x", "delimiters": ["|"], "extra": True},
+            {"name": "x", "delimiters": ["|"], "aliases": [""]},
+            {"name": "x", "delimiters": ["|", "||"]},
+        ],
+    )
+    def test_rules_from_dict_rejects_invalid(self, data):
+        """Malformed definitions should be reported at load time."""
+        with pytest.raises(ValueError):
+            rules_from_dict(data)
+
+    def test_load_rules_file(self, tmp_path):
+        """Config files may hold a list of language definitions."""
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps({"languages": [
+            {"name": "classical_chinese", "aliases": ["lzh-classical"], "delimiters": ["。", "，"]},
+            {"name": "sanskrit", "delimiters": ["|"]},
+        ]}, ensure_ascii=False), encoding="utf-8")
+
+        specs = load_rules_file(path)
+
+        assert [rules.name for rules, _ in specs] == ["classical_chinese", "sanskrit"]
+        assert specs[0][0].delimiters == ("。", "，")
+
+    def test_load_rules_file_reports_path(self, tmp_path):
+        """Errors in a config file should mention the file."""
+        path = tmp_path / "bad.json"
+        path.write_text(json.dumps({"name": "x", "delimiters": []}), encoding="utf-8")
+        with pytest.raises(ValueError, match="bad.json"):
+            load_rules_file(path)
+
+
+class TestRuleRegistry:
+    """Test rule registration and lookup."""
+
+    def test_known_language_lookup(self):
+        """Built-in aliases resolve case-insensitively."""
+        assert get_rules(" BO ") is tibetan.rules
+        assert get_rules("en") is english.rules
+
+    def test_unknown_language_raises(self):
+        """Unknown languages no longer fall back to English rules."""
+        with pytest.raises(UnsupportedLanguageError, match="klingon"):
+            get_rules("klingon")
+
+    def test_register_rules(self, registry):
+        """Registered rules resolve by name and alias."""
+        rules = register_rules(LanguageRules("sanskrit", ("|",)), aliases=("SA",))
+        assert get_rules("sanskrit") is rules
+        assert get_rules("sa") is rules
+
+    def test_register_rules_file(self, registry, tmp_path):
+        """Rules from a config file are usable for post-processing."""
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps({
+            "name": "sanskrit",
+            "delimiters": ["|"],
+            "merge_templates": [["DELIM", " ", "DELIM"]],
+        }), encoding="utf-8")
+
+        register_rules_file(path)
+
+        assert post_process_tokens(["a", "|", " ", "|", "b"], get_rules("sanskrit")) == ["a", "| |", "b"]
+
+    def test_rules_path_env_is_loaded(self, external_rules, tmp_path):
+        """Config files listed in RULES_PATH_ENV are registered on first lookup."""
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps({"name": "sanskrit", "aliases": ["sa"], "delimiters": ["|"]}), encoding="utf-8")
+        external_rules.setenv(factory.RULES_PATH_ENV, str(path))
+
+        assert get_rules("sa").name == "sanskrit"
+
+    def test_existing_name_requires_override(self, registry):
+        """Registering other rules under a taken name raises unless override is passed."""
+        with pytest.raises(ValueError, match="override=True"):
+            register_rules(LanguageRules("english", (".",)))
+        with pytest.raises(ValueError, match="'en'"):
+            register_rules(LanguageRules("sanskrit", ("|",)), aliases=("en",))
+        assert "sanskrit" not in registry
+        assert get_rules("en") is english.rules
+        # Registering the same rules again is not a conflict
+        assert register_rules(english.rules, aliases=("en",)) is english.rules
+
+    def test_override_moves_all_aliases(self, registry):
+        """Overriding one name replaces the rules under every alias of the old rules."""
+        rules = register_rules(LanguageRules("english", (".",)), override=True)
+
+        assert get_rules("english") is rules
+        assert get_rules("en") is rules
+        assert get_rules("eng") is rules
+        assert get_rules("bo") is tibetan.rules
+
+    def test_external_rules_cannot_replace_registered_names(self, external_rules, tmp_path):
+        """A RULES_PATH_ENV file reusing a built-in name is skipped, not applied to one alias."""
+        path = tmp_path / "english.json"
+        path.write_text(json.dumps({"name": "english", "delimiters": ["."]}), encoding="utf-8")
+        external_rules.setenv(factory.RULES_PATH_ENV, str(path))
+
+        with pytest.warns(RuntimeWarning, match="english.json"):
+            assert get_rules("english") is english.rules
+        assert get_rules("en") is english.rules
+
+    def test_application_rules_checked_against_external_rules(self, external_rules, tmp_path):
+        """External sources load before application registrations, which must override explicitly."""
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps({"name": "sanskrit", "aliases": ["sa"], "delimiters": ["|"]}), encoding="utf-8")
+        external_rules.setenv(factory.RULES_PATH_ENV, str(path))
+        rules = LanguageRules("sanskrit", ("|", "॥"))
+
+        with pytest.raises(ValueError, match="sanskrit"):
+            register_rules(rules)
+        register_rules(rules, override=True)
+
+        assert get_rules("sanskrit") is rules
+        assert get_rules("sa") is rules
+
+    def test_failing_rules_source_is_skipped_once(self, external_rules, tmp_path, monkeypatch):
+        """Broken sources warn once; built-in languages and other sources keep working."""
+        good = tmp_path / "good.json"
+        good.write_text(json.dumps({"name": "sanskrit", "delimiters": ["|"]}), encoding="utf-8")
+        missing = tmp_path / "missing.json"
+        external_rules.setenv(factory.RULES_PATH_ENV, f"{good}{os.pathsep}{missing}")
+        entry_point_calls = []
+        monkeypatch.setattr(factory, "iter_entry_points", lambda: entry_point_calls.append(1) or [BrokenEntryPoint()])
+
+        with pytest.warns(RuntimeWarning) as record:
+            assert get_rules("bo") is tibetan.rules
+        messages = [str(warning.message) for warning in record]
+        assert len(messages) == 2
+        assert "entry point 'broken'" in messages[0]
+        assert str(missing) in messages[1]
+        assert get_rules("sanskrit").name == "sanskrit"
+
+        # Sources are not discovered or read again on later lookups
+        missing.write_text(json.dumps({"name": "pali", "delimiters": ["."]}), encoding="utf-8")
+        with pytest.raises(UnsupportedLanguageError, match="missing.json"):
+            get_rules("pali")
+        assert entry_point_calls == [1]
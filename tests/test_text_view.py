@@ -0,0 +1,88 @@
+"""Tests for lazy segment text views and streamed segment output."""
+
+import io
+
+import pytest
+
+from milvus_segment_generator.segmentation.base import chunk_spans, MAX_SEGMENT_CHAR_SPAN
+from milvus_segment_generator.segmentation.rules import tibetan, english
+from milvus_segment_generator.segmentation.text_view import SegmentTextView, write_segmented_text
+
+
+TIBETAN_TOKENS = [
+    "ཤ", "ཱ", "་", "རི", "འི", "་", "བུ", "།",
+    "དེ", "་", "ལྟ", "་", "བ", "ས", "།", "ན", "་",
+    "སྟ", "ོང", "་", "པ", "༎", "ཉིད", "་", "ལ", "་",
+    "གཟུགས", "་", "མེད", "།",
+]
+
+
+def test_chunk_spans_without_text_returns_same_spans():
+    """Skipping text output should not change the spans."""
+    expected_spans, _ = chunk_spans(list(TIBETAN_TOKENS), tibetan.rules, segment_size=9, has_delimiter=True)
+    spans, segmented_text = chunk_spans(
+        list(TIBETAN_TOKENS), tibetan.rules, segment_size=9, has_delimiter=True, with_text=False
+    )
+    assert segmented_text is None
+    assert spans == expected_spans
+
+
+def test_view_matches_eager_segmented_text():
+    """The view yields the same segments chunk_spans joins eagerly."""
+    text = "".join(TIBETAN_TOKENS)
+    spans, segmented_text = chunk_spans(list(TIBETAN_TOKENS), tibetan.rules, segment_size=9, has_delimiter=True)
+
+    view = SegmentTextView(text, spans)
+
+    assert len(view) == len(spans)
+    assert list(view) == segmented_text.split("\n")
+    assert view[0] == "ཤཱ་རིའི་བུ།"
+    assert view[-1] == "ཉིད་ལ་གཟུགས་མེད།"
+    assert list(view[1:3]) == segmented_text.split("\n")[1:3]
+    assert str(view) == segmented_text
+
+
+def test_view_without_trailing_delimiter():
+    """Trimmed last spans (has_delimiter=False) slice the source text correctly."""
+    text = "Hello. World"
+    tokens = ["Hello", ".", " ", "World", english.rules.delimiters[0]]
+    spans, segmented_text = chunk_spans(tokens, english.rules, segment_size=3, has_delimiter=False)
+
+    view = SegmentTextView(text, spans)
+
+    assert str(view) == segmented_text == "Hello.\n World"
+
+
+def test_write_segmented_text_streams_joined_segments():
+    """Writing to a handle produces the newline-joined segment text."""
+    text = "".join(TIBETAN_TOKENS)
+    spans, segmented_text = chunk_spans(list(TIBETAN_TOKENS), tibetan.rules, segment_size=9, has_delimiter=True)
+    handle = io.StringIO()
+
+    written = write_segmented_text(text, spans, handle)
+
+    assert handle.getvalue() == segmented_text
+    assert written == len(segmented_text)
+
+
+def test_view_write_to_with_oversized_segment():
+    """Split oversized segments stream the same as the eager output."""
+    long_token = "a" * (MAX_SEGMENT_CHAR_SPAN + 100)
+    text = long_token + "."
+    spans, segmented_text = chunk_spans([long_token, "."], english.rules, segment_size=10, has_delimiter=True)
+    handle = io.StringIO()
+
+    SegmentTextView(text, spans).write_to(handle)
+
+    assert handle.getvalue() == segmented_text
+
+
+def test_empty_view():
+    """An empty span list gives an empty view and writes nothing."""
+    view = SegmentTextView("", [])
+    handle = io.StringIO()
+    assert len(view) == 0
+    assert str(view) == ""
+    assert view.write_to(handle) == 0
+    with pytest.raises(IndexError):
+        view[0]
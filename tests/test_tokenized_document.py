@@ -0,0 +1,159 @@
+"""Tests for reusable tokenized documents."""
+
+import pytest
+
+from milvus_segment_generator import tokenizer
+from milvus_segment_generator.document import TokenizedDocument
+from milvus_segment_generator.segment import segment_text
+from milvus_segment_generator.segmentation.base import chunk_spans, MAX_SEGMENT_UTF8_BYTES
+from milvus_segment_generator.segmentation.profiling import SegmentationProfile
+from milvus_segment_generator.segmentation.rules import tibetan, english
+
+
+TIBETAN_TOKENS = [
+    "ཤ", "ཱ", "་", "རི", "འི", "་", "བུ", "།",
+    "དེ", "་", "ལྟ", "་", "བ", "ས", "།", "ན", "་",
+    "སྟ", "ོང", "་", "པ", "༎", "ཉིད", "་", "ལ", "་",
+    "གཟུགས", "་", "མེད", "།",
+    "ཚོར", "་", "མེད", "།",
+    "འདུ", "་", "ཤེས", "༔", "མེད", "།"
+]
+
+
+def test_document_offsets_and_mask():
+    """Offsets and delimiter mask describe the merged tokens."""
+    document = TokenizedDocument.from_tokens(["Hello", ".", " ", "World", "!"], english.rules, has_delimiter=True)
+
+    assert len(document) == 5
+    assert document.text == "Hello. World!"
+    assert list(document.char_offsets) == [0, 5, 6, 7, 12, 13]
+    assert list(document.byte_offsets) == [0, 5, 6, 7, 12, 13]
+    assert list(document.delimiter_mask) == [0, 1, 0, 0, 1]
+    assert document.tokens == ["Hello", ".", " ", "World", "!"]
+
+
+@pytest.mark.parametrize("segment_size", range(9, 17))
+def test_chunk_matches_chunk_spans_for_segment_size_sweep(segment_size):
+    """Each segment size gives the same result as chunk_spans."""
+    document = TokenizedDocument.from_tokens(TIBETAN_TOKENS, tibetan.rules, has_delimiter=True)
+
+    expected = chunk_spans(list(TIBETAN_TOKENS), tibetan.rules, segment_size, has_delimiter=True)
+
+    assert document.chunk(segment_size) == expected
+    assert document.chunk(segment_size, with_text=False) == (expected[0], None)
+
+
+def test_chunk_splits_oversized_multibyte_segment():
+    """Oversized segments are split exactly like chunk_spans."""
+    tokens = [("a" * (MAX_SEGMENT_UTF8_BYTES - 1)) + "ཀ", "."]
+    document = TokenizedDocument.from_tokens(tokens, english.rules, has_delimiter=True)
+
+    assert document.chunk(10) == chunk_spans(list(tokens), english.rules, 10, has_delimiter=True)
+
+
+def test_chunk_errors_and_profile():
+    """Invalid sizes and missing delimiters raise; profiles get one pass per call."""
+    document = TokenizedDocument.from_tokens(["a", "b", "c", "."], english.rules, has_delimiter=True)
+    profile = SegmentationProfile()
+
+    with pytest.raises(ValueError, match="positive"):
+        document.chunk(0)
+    with pytest.raises(ValueError, match="Unable to find a delimiter"):
+        document.chunk(2)
+    document.chunk(4, profile=profile)
+    document.chunk(8, profile=profile)
+
+    assert [summary["segment_size"] for summary in profile.report()["passes"]] == [4, 8]
+
+
+def test_from_text_tokenizes_once_for_a_sweep(stub_tokenizer, monkeypatch):
+    """A sweep over segment sizes costs one tokenization and matches segment_text."""
+    text = "ཤཱ་རིའི་བུ།དེ་ལྟ་བས།ན་སྟོང་པ༎ཉིད་ལ་གཟུགས་མེད།ཚོར་མེད།འདུ་ཤེས༔མེད" * 5
+    calls = []
+    original_encode = stub_tokenizer.encode
+
+    def counting_encode(*args, **kwargs):
+        calls.append(args)
+        return original_encode(*args, **kwargs)
+
+    monkeypatch.setattr(stub_tokenizer, "encode", counting_encode)
+
+    document = TokenizedDocument.from_text(text, "bo")
+    results = {size: document.chunk(size) for size in range(20, 120, 10)}
+
+    assert len(calls) == 1
+    assert not document.has_delimiter
+    for size, result in results.items():
+        assert result == segment_text(text, "bo", segment_size=size)
+
+
+def test_from_text_falls_back_to_characters(monkeypatch):
+    """When decoded tokens overrun the text, character tokens are used as in segment_text."""
+    class ExpandingTokenizer:
+        def encode(self, text, add_special_tokens=False):
+            return list(text)
+
+        def batch_decode(self, ids, skip_special_tokens=True):
+            return [token + token if token == "a" else token for token in ids]
+
+    monkeypatch.setattr(tokenizer, "_get_gemma_tokenizer", lambda: ExpandingTokenizer())
+    text = "a cat. a hat."
+
+    document = TokenizedDocument.from_text(text, "en")
+
+    assert document.char_level
+    assert document.text == text
+    assert document.chunk(20) == segment_text(text, "en", segment_size=20)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    """A saved document loads with identical data and chunks."""
+    # Text without a final delimiter: the tokenizer appends one and sets has_delimiter=False
+    document = TokenizedDocument.from_tokens(TIBETAN_TOKENS + ["ཀ", "།"], tibetan.rules, has_delimiter=False)
+
+    loaded = TokenizedDocument.load(document.save(tmp_path / "docs" / "doc.tokdoc"))
+
+    assert loaded.rules == tibetan.rules
+    assert loaded.text == document.text
+    assert loaded.char_offsets == document.char_offsets
+    assert loaded.byte_offsets == document.byte_offsets
+    assert loaded.delimiter_mask == document.delimiter_mask
+    assert loaded.has_delimiter is False
+    assert loaded.char_level is False
+    assert loaded.tokens == document.tokens
+    assert loaded.chunk(9) == document.chunk(9)
+
+
+def test_load_rejects_other_files(tmp_path):
+    """Loading a file that was not written by save raises ValueError."""
+    path = tmp_path / "not-a-document.bin"
+    path.write_bytes(b"\x00\x01garbage\n")
+    with pytest.raises(ValueError):
+        TokenizedDocument.load(path)
+
+
+@pytest.mark.parametrize(
+    "corrupt",
+    [
+        lambda data: data[:-3],
+        lambda data: data[:data.index(b"\n") + 20],
+        lambda data: data.replace(b'"char_level": false, ', b"", 1),
+    ],
+    ids=["truncated-text", "truncated-offsets", "missing-header-key"],
+)
+def test_load_rejects_damaged_files(tmp_path, corrupt):
+    """Truncated files and incomplete headers raise ValueError instead of loading partially."""
+    path = TokenizedDocument.from_tokens(TIBETAN_TOKENS, tibetan.rules, has_delimiter=True).save(tmp_path / "doc")
+    path.write_bytes(corrupt(path.read_bytes()))
+
+    with pytest.raises(ValueError):
+        TokenizedDocument.load(path)
+
+
+def test_load_rejects_offsets_not_matching_text(tmp_path):
+    """Offsets that do not end at the stored text length are rejected."""
+    document = TokenizedDocument.from_tokens(TIBETAN_TOKENS, tibetan.rules, has_delimiter=True)
+    document.char_offsets[-1] += 1
+
+    with pytest.raises(ValueError, match="offsets"):
+        TokenizedDocument.load(document.save(tmp_path / "doc"))